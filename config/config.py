@@ -7,6 +7,70 @@ class Config:
     BOT_TOKEN = os.getenv("BOT_TOKEN")
     API_URL = os.getenv("POLYMARKET_API_URL", "https://gamma-api.polymarket.com")
     DB_NAME = "polymarket_bot.db"
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "4"))
+    DB_BUSY_TIMEOUT = int(os.getenv("DB_BUSY_TIMEOUT", "5000"))
+    DB_COMMIT_INTERVAL = float(os.getenv("DB_COMMIT_INTERVAL", "0.005"))
+    DB_WRITE_BATCH = int(os.getenv("DB_WRITE_BATCH", "500"))
     ADMIN_IDS = [int(x) for x in os.getenv("ADMIN_IDS", "").split(",") if x]
 
-config = Config()
\ No newline at end of file
+    HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+    HTTP_POOL_PER_HOST = int(os.getenv("HTTP_POOL_PER_HOST", "20"))
+    HTTP_DNS_TTL = int(os.getenv("HTTP_DNS_TTL", "300"))
+    HTTP_KEEPALIVE = float(os.getenv("HTTP_KEEPALIVE", "60"))
+    HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+    HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.25"))
+    HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "4"))
+    HTTP_RETRY_AFTER_MAX = float(os.getenv("HTTP_RETRY_AFTER_MAX", "30"))
+    BREAKER_THRESHOLD = int(os.getenv("BREAKER_THRESHOLD", "5"))
+    BREAKER_RESET = float(os.getenv("BREAKER_RESET", "30"))
+    GAMMA_RATE = float(os.getenv("GAMMA_RATE", "20"))
+    DATA_RATE = float(os.getenv("DATA_RATE", "10"))
+    GRAPH_RATE = float(os.getenv("GRAPH_RATE", "5"))
+    CLOB_RATE = float(os.getenv("CLOB_RATE", "10"))
+    INTERACTIVE_RATE = float(os.getenv("INTERACTIVE_RATE", "5"))
+
+    TG_GLOBAL_RATE = float(os.getenv("TG_GLOBAL_RATE", "25"))
+    TG_PER_CHAT_INTERVAL = float(os.getenv("TG_PER_CHAT_INTERVAL", "1.0"))
+    TG_WORKERS = int(os.getenv("TG_WORKERS", "8"))
+    TG_MAX_ATTEMPTS = int(os.getenv("TG_MAX_ATTEMPTS", "5"))
+    TG_ARB_MAX_AGE = float(os.getenv("TG_ARB_MAX_AGE", "900"))
+    TG_LISTING_MAX_AGE = float(os.getenv("TG_LISTING_MAX_AGE", "3600"))
+    TG_DIGEST_WINDOW = float(os.getenv("TG_DIGEST_WINDOW", "15"))
+
+    CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    CACHE_STALE_TTL = float(os.getenv("CACHE_STALE_TTL", "300"))
+    JSON_THREAD_THRESHOLD = int(os.getenv("JSON_THREAD_THRESHOLD", str(256 * 1024)))
+
+    SNAPSHOT_INTERVAL = float(os.getenv("SNAPSHOT_INTERVAL", "60"))
+    SNAPSHOT_PAGE_SIZE = int(os.getenv("SNAPSHOT_PAGE_SIZE", "500"))
+    # pages go oldest first, SNAPSHOT_PAGE_SIZE * SNAPSHOT_MAX_PAGES must stay above the live market count
+    SNAPSHOT_MAX_PAGES = int(os.getenv("SNAPSHOT_MAX_PAGES", "100"))
+    SNAPSHOT_PAGE_CONCURRENCY = int(os.getenv("SNAPSHOT_PAGE_CONCURRENCY", "4"))
+
+    ARB_MAX_TOTAL = float(os.getenv("ARB_MAX_TOTAL", "0.985"))
+    ARB_CONFIRM_TOP = int(os.getenv("ARB_CONFIRM_TOP", "8"))
+
+    FEED_ENABLED = os.getenv("FEED_ENABLED", "1").lower() in ("1", "true", "yes")
+    FEED_URL = os.getenv("FEED_URL", "wss://ws-subscriptions-clob.polymarket.com/ws/market")
+    FEED_PING_INTERVAL = float(os.getenv("FEED_PING_INTERVAL", "10"))
+    FEED_BACKOFF_MAX = float(os.getenv("FEED_BACKOFF_MAX", "60"))
+    FEED_STALE_AFTER = float(os.getenv("FEED_STALE_AFTER", "120"))
+    PRICE_POLL_MIN = float(os.getenv("PRICE_POLL_MIN", "5"))
+    PRICE_POLL_MAX = float(os.getenv("PRICE_POLL_MAX", "300"))
+    PRICE_POLL_STREAMING = float(os.getenv("PRICE_POLL_STREAMING", "300"))
+    PRICE_POLL_BUDGET = float(os.getenv("PRICE_POLL_BUDGET", "10"))
+    PRICE_FAR_DISTANCE = float(os.getenv("PRICE_FAR_DISTANCE", "0.10"))
+    PRICE_WATCH_TICK = float(os.getenv("PRICE_WATCH_TICK", "5"))
+
+    SCANNER_PAGE_SIZE = int(os.getenv("SCANNER_PAGE_SIZE", "50"))
+    SCANNER_MAX_PAGES = int(os.getenv("SCANNER_MAX_PAGES", "20"))
+    SCAN_SNAPSHOTS = os.getenv("SCAN_SNAPSHOTS", "0").lower() in ("1", "true", "yes")
+    SCAN_SNAPSHOT_DIR = os.getenv("SCAN_SNAPSHOT_DIR", "scan_snapshots")
+    SCAN_SNAPSHOT_KEEP = int(os.getenv("SCAN_SNAPSHOT_KEEP", "24"))
+
+    WALLET_POLL_INTERVAL = float(os.getenv("WALLET_POLL_INTERVAL", "60"))
+    WALLET_CONCURRENCY = int(os.getenv("WALLET_CONCURRENCY", "10"))
+    WALLET_TIMEOUT = float(os.getenv("WALLET_TIMEOUT", "30"))
+    WALLET_BATCH_SIZE = int(os.getenv("WALLET_BATCH_SIZE", "25"))
+
+config = Config()
@@ -1,243 +1,464 @@
 import aiosqlite
+import asyncio
 import json
+import logging
 from contextlib import asynccontextmanager
+from itertools import groupby
 from config.config import config
 
+logger = logging.getLogger(__name__)
+
+class WriteOp:
+    __slots__ = ("sql", "params", "future", "fetch")
+
+    def __init__(self, sql, params, future, fetch):
+        self.sql = sql
+        self.params = params
+        self.future = future
+        self.fetch = fetch
+
 class Database:
-    def __init__(self):
-        self.db_path = config.DB_NAME
+    def __init__(self, db_path=None):
+        self.db_path = db_path or config.DB_NAME
+        self.pool_size = config.DB_POOL_SIZE
+        self._readers = []
+        self._pool = None
+        self._writer = None
+        self._writer_task = None
+        self._write_lock = None
+        self._write_queue = None
+
+    async def _open(self, readonly=False):
+        conn = await aiosqlite.connect(self.db_path)
+        conn.row_factory = aiosqlite.Row
+        await conn.execute("PRAGMA journal_mode=WAL;")
+        await conn.execute("PRAGMA synchronous=NORMAL;")
+        await conn.execute(f"PRAGMA busy_timeout={config.DB_BUSY_TIMEOUT};")
+        if readonly:
+            await conn.execute("PRAGMA query_only=ON;")
+        return conn
+
+    async def connect(self):
+        if self._writer is not None:
+            return
+        self._write_lock = asyncio.Lock()
+        self._writer = await self._open()
+        self._pool = asyncio.Queue()
+        for _ in range(self.pool_size):
+            conn = await self._open(readonly=True)
+            self._readers.append(conn)
+            self._pool.put_nowait(conn)
+        self._write_queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._writer_loop())
+
+    async def close(self):
+        if self._writer is None:
+            return
+        self._write_queue.put_nowait(None)
+        await self._writer_task
+        async with self._write_lock:
+            for conn in self._readers:
+                await conn.close()
+            await self._writer.close()
+        self._readers = []
+        self._pool = None
+        self._writer = None
+        self._writer_task = None
 
     @asynccontextmanager
     async def get_connection(self):
-        async with aiosqlite.connect(self.db_path) as conn:
-            conn.row_factory = aiosqlite.Row
+        if self._pool is None:
+            await self.connect()
+        conn = await self._pool.get()
+        try:
             yield conn
+        finally:
+            self._pool.put_nowait(conn)
 
-    async def create_tables(self):
-        async with self.get_connection() as db:
-            await db.execute("PRAGMA journal_mode=WAL;")
-            await db.execute("PRAGMA synchronous=NORMAL;")
-            
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS users (
-                    user_id INTEGER PRIMARY KEY,
-                    username TEXT,
-                    joined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    arb_alerts INTEGER DEFAULT 0,
-                    alert_markets INTEGER DEFAULT 0,
-                    alert_events INTEGER DEFAULT 0
-                )
-            ''')
-
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS watchlist (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER,
-                    market_id TEXT,
-                    market_slug TEXT,
-                    alert_price REAL,
-                    condition TEXT,
-                    outcome TEXT DEFAULT 'YES', 
-                    FOREIGN KEY(user_id) REFERENCES users(user_id)
-                )
-            ''')
-
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS tracked_wallets (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER,
-                    wallet_address TEXT,
-                    alias TEXT,
-                    last_tx_hash TEXT,
-                    min_vol REAL DEFAULT 0,
-                    price_target REAL DEFAULT 0,
-                    price_cond TEXT DEFAULT 'NONE',
-                    notify_new_markets INTEGER DEFAULT 1,
-                    seen_markets TEXT DEFAULT '[]',
-                    FOREIGN KEY(user_id) REFERENCES users(user_id)
-                )
-            ''')
-            
+    @asynccontextmanager
+    async def get_writer(self):
+        if self._writer is None:
+            await self.connect()
+        async with self._write_lock:
             try:
-                await db.execute("ALTER TABLE users ADD COLUMN arb_alerts INTEGER DEFAULT 0")
-            except: pass
+                yield self._writer
+            except Exception:
+                await self._writer.rollback()
+                raise
 
+    async def execute_write(self, sql, params=(), wait=True, fetch=False):
+        if self._writer is None:
+            await self.connect()
+        future = asyncio.get_running_loop().create_future() if wait or fetch else None
+        self._write_queue.put_nowait(WriteOp(sql, params, future, fetch))
+        if future is not None:
+            return await future
+
+    async def _writer_loop(self):
+        running = True
+        while running:
+            op = await self._write_queue.get()
+            if op is None:
+                break
+            # let concurrent writers pile up so the whole group shares one commit
+            await asyncio.sleep(config.DB_COMMIT_INTERVAL)
+            batch = [op]
+            while len(batch) < config.DB_WRITE_BATCH:
+                try:
+                    op = self._write_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if op is None:
+                    running = False
+                    break
+                batch.append(op)
+            await self._commit_batch(batch)
+
+    async def _commit_batch(self, batch):
+        results = []
+        try:
+            async with self.get_writer() as db:
+                for (sql, fetch), group in groupby(batch, key=lambda op: (op.sql, op.fetch)):
+                    group = list(group)
+                    if fetch:
+                        for op in group:
+                            cursor = await db.execute(op.sql, op.params)
+                            results.append((op, (cursor.rowcount, cursor.lastrowid)))
+                    else:
+                        await db.executemany(sql, [op.params for op in group])
+                        results.extend((op, None) for op in group)
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Group commit of {len(batch)} writes failed, retrying one by one: {e}")
+            await self._commit_each(batch)
+            return
+
+        for op, result in results:
+            if op.future is not None and not op.future.done():
+                op.future.set_result(result)
+
+    async def _commit_each(self, batch):
+        for op in batch:
             try:
-                await db.execute("ALTER TABLE users ADD COLUMN alert_markets INTEGER DEFAULT 0")
-            except: pass
+                async with self.get_writer() as db:
+                    cursor = await db.execute(op.sql, op.params)
+                    result = (cursor.rowcount, cursor.lastrowid) if op.fetch else None
+                    await db.commit()
+            except Exception as e:
+                if op.future is not None and not op.future.done():
+                    op.future.set_exception(e)
+                else:
+                    logger.error(f"Write failed: {e}")
+                continue
+            if op.future is not None and not op.future.done():
+                op.future.set_result(result)
+
+    async def create_tables(self, target_version=None):
+        migrations = [
+            self._migrate_base_schema,
+            self._migrate_seen_markets,
+            self._migrate_indexes,
+            self._migrate_digest_mode,
+            self._migrate_scanner_state,
+        ]
+        target = len(migrations) if target_version is None else target_version
+
+        async with self.get_writer() as db:
+            async with db.execute("PRAGMA user_version") as cursor:
+                version = (await cursor.fetchone())[0]
+
+            for step in range(version, target):
+                await migrations[step](db)
+                await db.execute(f"PRAGMA user_version = {step + 1}")
+                await db.commit()
+                logger.info(f"Database migrated to schema v{step + 1}")
+
+    async def _add_missing_columns(self, db, table, columns):
+        async with db.execute(f"PRAGMA table_info({table})") as cursor:
+            existing = {row['name'] for row in await cursor.fetchall()}
+        for name, ddl in columns:
+            if name not in existing:
+                await db.execute(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}")
 
+    async def _migrate_base_schema(self, db):
+        await db.execute('''
+            CREATE TABLE IF NOT EXISTS users (
+                user_id INTEGER PRIMARY KEY,
+                username TEXT,
+                joined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                arb_alerts INTEGER DEFAULT 0,
+                alert_markets INTEGER DEFAULT 0,
+                alert_events INTEGER DEFAULT 0
+            )
+        ''')
+
+        await db.execute('''
+            CREATE TABLE IF NOT EXISTS watchlist (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER,
+                market_id TEXT,
+                market_slug TEXT,
+                alert_price REAL,
+                condition TEXT,
+                outcome TEXT DEFAULT 'YES', 
+                FOREIGN KEY(user_id) REFERENCES users(user_id)
+            )
+        ''')
+
+        await db.execute('''
+            CREATE TABLE IF NOT EXISTS tracked_wallets (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER,
+                wallet_address TEXT,
+                alias TEXT,
+                last_tx_hash TEXT,
+                min_vol REAL DEFAULT 0,
+                price_target REAL DEFAULT 0,
+                price_cond TEXT DEFAULT 'NONE',
+                notify_new_markets INTEGER DEFAULT 1,
+                seen_markets TEXT DEFAULT '[]',
+                FOREIGN KEY(user_id) REFERENCES users(user_id)
+            )
+        ''')
+
+        # databases created before these settings existed
+        await self._add_missing_columns(db, "users", [
+            ("arb_alerts", "INTEGER DEFAULT 0"),
+            ("alert_markets", "INTEGER DEFAULT 0"),
+            ("alert_events", "INTEGER DEFAULT 0"),
+        ])
+
+    async def _migrate_seen_markets(self, db):
+        await db.execute('''
+            CREATE TABLE IF NOT EXISTS wallet_seen_markets (
+                wallet_id INTEGER NOT NULL,
+                market_id TEXT NOT NULL,
+                PRIMARY KEY (wallet_id, market_id)
+            ) WITHOUT ROWID
+        ''')
+
+        async with db.execute(
+            "SELECT id, seen_markets FROM tracked_wallets WHERE seen_markets IS NOT NULL AND seen_markets NOT IN ('', '[]')"
+        ) as cursor:
+            rows = await cursor.fetchall()
+
+        for row in rows:
             try:
-                await db.execute("ALTER TABLE users ADD COLUMN alert_events INTEGER DEFAULT 0")
-            except: pass
-            
-            await db.commit()
+                seen = json.loads(row['seen_markets'])
+            except ValueError:
+                seen = []
+            await db.executemany(
+                "INSERT OR IGNORE INTO wallet_seen_markets (wallet_id, market_id) VALUES (?, ?)",
+                [(row['id'], str(m)) for m in seen if m]
+            )
+            await db.execute("UPDATE tracked_wallets SET seen_markets = '[]' WHERE id = ?", (row['id'],))
 
-    async def add_user(self, user_id, username):
-        async with self.get_connection() as db:
-            await db.execute(
-                "INSERT OR IGNORE INTO users (user_id, username) VALUES (?, ?)", 
-                (user_id, username)
+    async def _migrate_indexes(self, db):
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_watchlist_user ON watchlist(user_id)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_watchlist_market ON watchlist(market_id)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_tracked_wallets_user ON tracked_wallets(user_id)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_users_arb ON users(user_id) WHERE arb_alerts = 1")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_users_markets ON users(user_id) WHERE alert_markets = 1")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_users_events ON users(user_id) WHERE alert_events = 1")
+
+    async def _migrate_digest_mode(self, db):
+        await self._add_missing_columns(db, "users", [("digest_mode", "INTEGER DEFAULT 0")])
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_users_digest ON users(user_id) WHERE digest_mode = 1")
+
+    async def _migrate_scanner_state(self, db):
+        await db.execute('''
+            CREATE TABLE IF NOT EXISTS scanner_state (
+                name TEXT PRIMARY KEY,
+                value TEXT NOT NULL
             )
-            await db.commit()
+        ''')
+
+    async def get_scanner_state(self, name):
+        async with self.get_connection() as db:
+            async with db.execute("SELECT value FROM scanner_state WHERE name = ?", (name,)) as cursor:
+                row = await cursor.fetchone()
+            return json.loads(row['value']) if row else None
+
+    async def set_scanner_state(self, name, value):
+        await self.execute_write(
+            "INSERT INTO scanner_state (name, value) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+            (name, json.dumps(value))
+        )
+
+    async def add_user(self, user_id, username):
+        await self.execute_write(
+            "INSERT OR IGNORE INTO users (user_id, username) VALUES (?, ?)", 
+            (user_id, username)
+        )
 
     async def get_user_settings(self, user_id):
         async with self.get_connection() as db:
-            cursor = await db.execute("SELECT arb_alerts, alert_markets, alert_events FROM users WHERE user_id = ?", (user_id,))
-            row = await cursor.fetchone()
-            return dict(row) if row else {'arb_alerts': 0, 'alert_markets': 0, 'alert_events': 0}
+            async with db.execute("SELECT arb_alerts, alert_markets, alert_events, digest_mode FROM users WHERE user_id = ?", (user_id,)) as cursor:
+                row = await cursor.fetchone()
+            return dict(row) if row else {'arb_alerts': 0, 'alert_markets': 0, 'alert_events': 0, 'digest_mode': 0}
 
     async def toggle_arb_alerts(self, user_id):
-        async with self.get_connection() as db:
-            cursor = await db.execute("SELECT arb_alerts FROM users WHERE user_id = ?", (user_id,))
-            row = await cursor.fetchone()
-            current = row['arb_alerts'] if row else 0
-            new_val = 1 if current == 0 else 0
-            await db.execute("UPDATE users SET arb_alerts = ? WHERE user_id = ?", (new_val, user_id))
-            await db.commit()
-            return new_val
+        await self.execute_write(
+            "UPDATE users SET arb_alerts = CASE WHEN arb_alerts = 1 THEN 0 ELSE 1 END WHERE user_id = ?",
+            (user_id,)
+        )
+        settings = await self.get_user_settings(user_id)
+        return settings['arb_alerts']
 
     async def toggle_market_alerts(self, user_id):
-        async with self.get_connection() as db:
-            cursor = await db.execute("SELECT alert_markets FROM users WHERE user_id = ?", (user_id,))
-            row = await cursor.fetchone()
-            current = row['alert_markets'] if row else 0
-            new_val = 1 if current == 0 else 0
-            await db.execute("UPDATE users SET alert_markets = ? WHERE user_id = ?", (new_val, user_id))
-            await db.commit()
-            return new_val
+        await self.execute_write(
+            "UPDATE users SET alert_markets = CASE WHEN alert_markets = 1 THEN 0 ELSE 1 END WHERE user_id = ?",
+            (user_id,)
+        )
+        settings = await self.get_user_settings(user_id)
+        return settings['alert_markets']
 
     async def toggle_event_alerts(self, user_id):
+        await self.execute_write(
+            "UPDATE users SET alert_events = CASE WHEN alert_events = 1 THEN 0 ELSE 1 END WHERE user_id = ?",
+            (user_id,)
+        )
+        settings = await self.get_user_settings(user_id)
+        return settings['alert_events']
+
+    async def toggle_digest_mode(self, user_id):
+        await self.execute_write(
+            "UPDATE users SET digest_mode = CASE WHEN digest_mode = 1 THEN 0 ELSE 1 END WHERE user_id = ?",
+            (user_id,)
+        )
+        settings = await self.get_user_settings(user_id)
+        return settings['digest_mode']
+
+    async def get_digest_users(self):
         async with self.get_connection() as db:
-            cursor = await db.execute("SELECT alert_events FROM users WHERE user_id = ?", (user_id,))
-            row = await cursor.fetchone()
-            current = row['alert_events'] if row else 0
-            new_val = 1 if current == 0 else 0
-            await db.execute("UPDATE users SET alert_events = ? WHERE user_id = ?", (new_val, user_id))
-            await db.commit()
-            return new_val
+            async with db.execute("SELECT user_id FROM users WHERE digest_mode = 1") as cursor:
+                rows = await cursor.fetchall()
+            return [row['user_id'] for row in rows]
 
     async def get_users_for_arb(self):
         async with self.get_connection() as db:
-            cursor = await db.execute("SELECT user_id FROM users WHERE arb_alerts = 1")
-            rows = await cursor.fetchall()
+            async with db.execute("SELECT user_id FROM users WHERE arb_alerts = 1") as cursor:
+                rows = await cursor.fetchall()
             return [row['user_id'] for row in rows]
 
     async def get_users_for_markets(self):
         async with self.get_connection() as db:
-            cursor = await db.execute("SELECT user_id FROM users WHERE alert_markets = 1")
-            rows = await cursor.fetchall()
+            async with db.execute("SELECT user_id FROM users WHERE alert_markets = 1") as cursor:
+                rows = await cursor.fetchall()
             return [row['user_id'] for row in rows]
 
     async def get_users_for_events(self):
         async with self.get_connection() as db:
-            cursor = await db.execute("SELECT user_id FROM users WHERE alert_events = 1")
-            rows = await cursor.fetchall()
+            async with db.execute("SELECT user_id FROM users WHERE alert_events = 1") as cursor:
+                rows = await cursor.fetchall()
             return [row['user_id'] for row in rows]
 
     async def add_to_watchlist(self, user_id, market_id, slug, price, condition, outcome="YES"):
-        async with self.get_connection() as db:
-            await db.execute(
-                "INSERT INTO watchlist (user_id, market_id, market_slug, alert_price, condition, outcome) VALUES (?, ?, ?, ?, ?, ?)",
-                (user_id, market_id, slug, price, condition, outcome)
-            )
-            await db.commit()
+        _, lastrowid = await self.execute_write(
+            "INSERT INTO watchlist (user_id, market_id, market_slug, alert_price, condition, outcome) VALUES (?, ?, ?, ?, ?, ?)",
+            (user_id, market_id, slug, price, condition, outcome),
+            fetch=True
+        )
+        return lastrowid
 
     async def get_all_watchlists(self):
         async with self.get_connection() as db:
-            cursor = await db.execute("SELECT * FROM watchlist")
-            rows = await cursor.fetchall()
+            async with db.execute("SELECT * FROM watchlist") as cursor:
+                rows = await cursor.fetchall()
             return [dict(row) for row in rows]
 
     async def get_user_watchlist(self, user_id):
         async with self.get_connection() as db:
-            cursor = await db.execute("SELECT * FROM watchlist WHERE user_id = ?", (user_id,))
-            rows = await cursor.fetchall()
+            async with db.execute("SELECT * FROM watchlist WHERE user_id = ?", (user_id,)) as cursor:
+                rows = await cursor.fetchall()
             return [dict(row) for row in rows]
 
     async def get_alert_by_id(self, alert_id):
         async with self.get_connection() as db:
-            cursor = await db.execute("SELECT * FROM watchlist WHERE id = ?", (alert_id,))
-            row = await cursor.fetchone()
+            async with db.execute("SELECT * FROM watchlist WHERE id = ?", (alert_id,)) as cursor:
+                row = await cursor.fetchone()
             return dict(row) if row else None
 
     async def update_alert(self, alert_id, price, condition, outcome):
-        async with self.get_connection() as db:
-            await db.execute(
-                "UPDATE watchlist SET alert_price = ?, condition = ?, outcome = ? WHERE id = ?",
-                (price, condition, outcome, alert_id)
-            )
-            await db.commit()
+        await self.execute_write(
+            "UPDATE watchlist SET alert_price = ?, condition = ?, outcome = ? WHERE id = ?",
+            (price, condition, outcome, alert_id)
+        )
 
     async def delete_alert(self, alert_id, user_id):
-        async with self.get_connection() as db:
-            cursor = await db.execute(
-                "DELETE FROM watchlist WHERE id = ? AND user_id = ?", 
-                (alert_id, user_id)
-            )
-            await db.commit()
-            return cursor.rowcount > 0
+        rowcount, _ = await self.execute_write(
+            "DELETE FROM watchlist WHERE id = ? AND user_id = ?", 
+            (alert_id, user_id),
+            fetch=True
+        )
+        return rowcount > 0
 
     async def add_wallet(self, user_id, address, alias):
-        async with self.get_connection() as db:
-            await db.execute(
-                "INSERT INTO tracked_wallets (user_id, wallet_address, alias, seen_markets) VALUES (?, ?, ?, ?)",
-                (user_id, address, alias, json.dumps([]))
-            )
-            await db.commit()
+        _, lastrowid = await self.execute_write(
+            "INSERT INTO tracked_wallets (user_id, wallet_address, alias) VALUES (?, ?, ?)",
+            (user_id, address, alias),
+            fetch=True
+        )
+        return lastrowid
 
     async def get_tracked_wallets(self):
         async with self.get_connection() as db:
-            cursor = await db.execute("SELECT * FROM tracked_wallets")
-            rows = await cursor.fetchall()
+            async with db.execute("SELECT * FROM tracked_wallets") as cursor:
+                rows = await cursor.fetchall()
             return [dict(row) for row in rows]
 
     async def get_user_wallets(self, user_id):
         async with self.get_connection() as db:
-            cursor = await db.execute("SELECT * FROM tracked_wallets WHERE user_id = ?", (user_id,))
-            rows = await cursor.fetchall()
+            async with db.execute("SELECT * FROM tracked_wallets WHERE user_id = ?", (user_id,)) as cursor:
+                rows = await cursor.fetchall()
             return [dict(row) for row in rows]
     
     async def get_wallet_by_id(self, wallet_id):
         async with self.get_connection() as db:
-            cursor = await db.execute("SELECT * FROM tracked_wallets WHERE id = ?", (wallet_id,))
-            row = await cursor.fetchone()
+            async with db.execute("SELECT * FROM tracked_wallets WHERE id = ?", (wallet_id,)) as cursor:
+                row = await cursor.fetchone()
             return dict(row) if row else None
 
     async def delete_wallet(self, wallet_id, user_id):
-        async with self.get_connection() as db:
-            cursor = await db.execute(
-                "DELETE FROM tracked_wallets WHERE id = ? AND user_id = ?", 
-                (wallet_id, user_id)
-            )
-            await db.commit()
-            return cursor.rowcount > 0
+        rowcount, _ = await self.execute_write(
+            "DELETE FROM tracked_wallets WHERE id = ? AND user_id = ?", 
+            (wallet_id, user_id),
+            fetch=True
+        )
+        if rowcount > 0:
+            await self.execute_write("DELETE FROM wallet_seen_markets WHERE wallet_id = ?", (wallet_id,))
+        return rowcount > 0
 
-    async def update_wallet_tx(self, wallet_id, tx_hash):
-        async with self.get_connection() as db:
-            await db.execute(
-                "UPDATE tracked_wallets SET last_tx_hash = ? WHERE id = ?", 
-                (tx_hash, wallet_id)
-            )
-            await db.commit()
+    async def update_wallet_tx(self, wallet_id, tx_hash, wait=False):
+        await self.execute_write(
+            "UPDATE tracked_wallets SET last_tx_hash = ? WHERE id = ?", 
+            (tx_hash, wallet_id),
+            wait=wait
+        )
 
-    async def update_wallet_seen_markets(self, wallet_id, seen_list):
+    async def get_all_seen_markets(self):
+        seen = {}
         async with self.get_connection() as db:
-            await db.execute(
-                "UPDATE tracked_wallets SET seen_markets = ? WHERE id = ?",
-                (json.dumps(seen_list), wallet_id)
-            )
-            await db.commit()
+            async with db.execute("SELECT wallet_id, market_id FROM wallet_seen_markets") as cursor:
+                async for row in cursor:
+                    seen.setdefault(row['wallet_id'], set()).add(row['market_id'])
+        return seen
+
+    async def add_wallet_seen_market(self, wallet_id, market_id, wait=False):
+        await self.execute_write(
+            "INSERT OR IGNORE INTO wallet_seen_markets (wallet_id, market_id) VALUES (?, ?)",
+            (wallet_id, market_id),
+            wait=wait
+        )
 
     async def update_wallet_settings(self, wallet_id, min_vol, price_target, price_cond, notify_new):
-        async with self.get_connection() as db:
-            await db.execute(
-                '''
-                UPDATE tracked_wallets 
-                SET min_vol = ?, price_target = ?, price_cond = ?, notify_new_markets = ?
-                WHERE id = ?
-                ''',
-                (min_vol, price_target, price_cond, notify_new, wallet_id)
-            )
-            await db.commit()
+        await self.execute_write(
+            '''
+            UPDATE tracked_wallets 
+            SET min_vol = ?, price_target = ?, price_cond = ?, notify_new_markets = ?
+            WHERE id = ?
+            ''',
+            (min_vol, price_target, price_cond, notify_new, wallet_id)
+        )
 
 db = Database()
\ No newline at end of file
@@ -1,8 +1,14 @@
 from aiogram import Router, types, F, Bot   
-from aiogram.filters import CommandStart
+from aiogram.filters import CommandStart, Command
 from aiogram.utils.keyboard import InlineKeyboardBuilder, ReplyKeyboardBuilder
 from database.database import db
-from services.api import poly_api
+from services.api import poly_api, UpstreamError
+from services.arbitrage import arbitrage
+from services.feed import feed
+from services.market_snapshot import market_snapshots
+from services.background import scheduler
+from services.notifier import notifier
+from config.config import config
 from aiogram.types import FSInputFile
 
 router = Router()
@@ -37,6 +43,52 @@ async def cmd_start(message: types.Message, bot: Bot):
     )
     await message.answer("Choose an action:", reply_markup=kb.as_markup())
 
+@router.message(Command("queue"), F.from_user.id.in_(config.ADMIN_IDS))
+async def queue_stats_handler(message: types.Message):
+    stats = notifier.stats()
+    text = "📬 <b>Delivery Queue</b>\n\n"
+    for name in ("alerts", "arbitrage", "listings"):
+        lane = stats[name]
+        text += (
+            f"<b>{name.title()}</b>: {lane['depth']} queued, "
+            f"oldest {lane['oldest_age']:.0f}s, shed {lane['shed']}, coalesced {lane['coalesced']}\n"
+        )
+    text += f"\n✅ Sent: {stats['sent']} | 🔁 Retried: {stats['retried']} | ❌ Failed: {stats['failed']}"
+    text += f"\n📦 Digested: {stats['digested']} ({stats['digest_pending']} waiting)"
+    cache = poly_api.cache.stats()
+    text += (
+        f"\n\n🗄 <b>API Cache</b>: {cache['entries']} entries, {cache['bytes'] / 1024:.0f} KiB\n"
+        f"hits {cache['hits']}, stale {cache['stale_hits']}, misses {cache['misses']}, "
+        f"304s {cache['revalidated']}, evicted {cache['evicted']}, coalesced {poly_api.coalesced}"
+    )
+    for name, breaker in poly_api.breakers.items():
+        limiter = poly_api.limiters[name]
+        text += (
+            f"\n🔌 {name}: {breaker.state}, trips {breaker.trips}, rejected {breaker.rejected}, "
+            f"{limiter.requests} requests, throttled {limiter.throttled} ({limiter.waited:.1f}s), 429s {limiter.limited}"
+        )
+    snapshot = market_snapshots.current
+    if snapshot is not None:
+        text += (
+            f"\n🗺 Snapshot v{snapshot.version}: {len(snapshot.markets)} markets, "
+            f"{len(snapshot.by_event)} events, {snapshot.age:.0f}s old, built in {market_snapshots.refresh_ms:.0f}ms, "
+            f"truncated {market_snapshots.truncated}"
+        )
+    text += (
+        f"\n💎 Arbitrage: {arbitrage.universe} markets in {arbitrage.compute_ms:.1f}ms, "
+        f"{arbitrage.screened} screened, {arbitrage.confirmed} fillable"
+    )
+    polling = scheduler.stats()
+    text += (
+        f"\n⏱ Polling: {polling['markets']} markets, {polling['fast']} fast, "
+        f"mean interval {polling['mean_interval']:.0f}s, {polling['polled']} polls"
+    )
+    text += (
+        f"\n📡 Feed: {'connected' if feed.connected else 'down'}, {len(feed.assets)} assets, "
+        f"{feed.messages} messages, {feed.reconnects} reconnects"
+    )
+    await message.answer(text, parse_mode="HTML")
+
 @router.callback_query(F.data == "back_home")
 async def back_home_handler(callback: types.CallbackQuery):
     kb = InlineKeyboardBuilder()
@@ -89,19 +141,28 @@ async def toggle_arb_handler(callback: types.CallbackQuery):
 @router.callback_query(F.data == "scan_arb_now")
 async def scan_arb_now_handler(callback: types.CallbackQuery):
     await callback.message.edit_text("🔎 Scanning markets...")
-    opps = await poly_api.check_arbitrage()
+    try:
+        opps = await arbitrage.scan(interactive=True)
+    except UpstreamError:
+        opps = None
+        text = "⚠️ Polymarket is unavailable right now. Please try again in a minute."
+    else:
+        text = "✅ No significant arbitrage opportunities found right now."
     
     if opps and len(opps) > 0:
         best = opps[0]
+        if best['kind'] == 'event':
+            prices = f"🧩 YES on all {best['legs']} outcomes: {best['yes']:.3f}"
+        else:
+            prices = f"🟩 YES: {best['yes']} | 🟥 NO: {best['no']}"
         text = (
             f"💎 <b>Best Opportunity Found</b>\n\n"
             f"❓ {best['question']}\n"
             f"📈 Profit: <b>{best['profit_str']}</b>\n"
-            f"🟩 YES: {best['yes']} | 🟥 NO: {best['no']}\n\n"
+            f"{prices}\n"
+            f"💧 Fillable: {best['size']:.0f} sets for ${best['cost']:.2f} (+${best['gain']:.2f})\n\n"
             f"🔗 <a href='{best['url']}'>Open Market</a>"
         )
-    else:
-        text = "✅ No significant arbitrage opportunities found right now."
         
     kb = InlineKeyboardBuilder()
     kb.button(text="🔙 Back", callback_data="menu_arb")
@@ -153,10 +214,12 @@ async def settings_handler(message: types.Message):
     
     mkt_status = "✅ ON" if user_settings['alert_markets'] else "❌ OFF"
     evt_status = "✅ ON" if user_settings['alert_events'] else "❌ OFF"
+    dig_status = "✅ ON" if user_settings['digest_mode'] else "❌ OFF"
     
     kb = InlineKeyboardBuilder()
     kb.button(text=f"📢 New Markets: {mkt_status}", callback_data="tog_mkt")
     kb.button(text=f"🗓 New Events: {evt_status}", callback_data="tog_evt")
+    kb.button(text=f"📦 Digest Mode: {dig_status}", callback_data="tog_digest")
     kb.button(text="📜 Changelog", callback_data="view_changelog")
     kb.button(text="🔙 Back", callback_data="back_home_settings")
     kb.adjust(1)
@@ -164,7 +227,8 @@ async def settings_handler(message: types.Message):
     await message.answer(
         "🛠 <b>Global Settings</b>\n\n"
         "<b>Markets:</b> Individual betting contracts (can be spammy).\n"
-        "<b>Events:</b> Grouped events (recommended).",
+        "<b>Events:</b> Grouped events (recommended).\n"
+        "<b>Digest:</b> Bundle notifications arriving close together into a single message.",
         reply_markup=kb.as_markup(),
         parse_mode="HTML"
     )
@@ -187,10 +251,12 @@ async def toggle_markets_handler(callback: types.CallbackQuery):
     user_settings = await db.get_user_settings(callback.from_user.id)
     mkt_status = "✅ ON" if user_settings['alert_markets'] else "❌ OFF"
     evt_status = "✅ ON" if user_settings['alert_events'] else "❌ OFF"
+    dig_status = "✅ ON" if user_settings['digest_mode'] else "❌ OFF"
     
     kb = InlineKeyboardBuilder()
     kb.button(text=f"📢 New Markets: {mkt_status}", callback_data="tog_mkt")
     kb.button(text=f"🗓 New Events: {evt_status}", callback_data="tog_evt")
+    kb.button(text=f"📦 Digest Mode: {dig_status}", callback_data="tog_digest")
     kb.button(text="📜 Changelog", callback_data="view_changelog")
     kb.button(text="🔙 Back", callback_data="back_home_settings")
     kb.adjust(1)
@@ -204,10 +270,32 @@ async def toggle_events_handler(callback: types.CallbackQuery):
     user_settings = await db.get_user_settings(callback.from_user.id)
     mkt_status = "✅ ON" if user_settings['alert_markets'] else "❌ OFF"
     evt_status = "✅ ON" if user_settings['alert_events'] else "❌ OFF"
+    dig_status = "✅ ON" if user_settings['digest_mode'] else "❌ OFF"
+    
+    kb = InlineKeyboardBuilder()
+    kb.button(text=f"📢 New Markets: {mkt_status}", callback_data="tog_mkt")
+    kb.button(text=f"🗓 New Events: {evt_status}", callback_data="tog_evt")
+    kb.button(text=f"📦 Digest Mode: {dig_status}", callback_data="tog_digest")
+    kb.button(text="📜 Changelog", callback_data="view_changelog")
+    kb.button(text="🔙 Back", callback_data="back_home_settings")
+    kb.adjust(1)
+    
+    await callback.message.edit_text("🛠 <b>Global Settings</b>", reply_markup=kb.as_markup(), parse_mode="HTML")
+
+@router.callback_query(F.data == "tog_digest")
+async def toggle_digest_handler(callback: types.CallbackQuery):
+    new_val = await db.toggle_digest_mode(callback.from_user.id)
+    notifier.set_digest(callback.from_user.id, new_val)
+    
+    user_settings = await db.get_user_settings(callback.from_user.id)
+    mkt_status = "✅ ON" if user_settings['alert_markets'] else "❌ OFF"
+    evt_status = "✅ ON" if user_settings['alert_events'] else "❌ OFF"
+    dig_status = "✅ ON" if user_settings['digest_mode'] else "❌ OFF"
     
     kb = InlineKeyboardBuilder()
     kb.button(text=f"📢 New Markets: {mkt_status}", callback_data="tog_mkt")
     kb.button(text=f"🗓 New Events: {evt_status}", callback_data="tog_evt")
+    kb.button(text=f"📦 Digest Mode: {dig_status}", callback_data="tog_digest")
     kb.button(text="📜 Changelog", callback_data="view_changelog")
     kb.button(text="🔙 Back", callback_data="back_home_settings")
     kb.adjust(1)
@@ -1,10 +1,11 @@
-import json
 from aiogram import Router, types, F
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import StatesGroup, State
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from database.database import db
-from services.api import poly_api
+from services.api import poly_api, UpstreamError
+from services.feed import feed
+from services.registry import registry
 
 router = Router()
 
@@ -43,7 +44,11 @@ async def add_link_handler(callback: types.CallbackQuery, state: FSMContext):
 @router.message(MarketStates.waiting_for_url)
 async def process_url(message: types.Message, state: FSMContext):
     url = message.text.strip()
-    markets = await poly_api.get_markets_by_url(url)
+    try:
+        markets = await poly_api.get_markets_by_url(url, interactive=True)
+    except UpstreamError:
+        await message.answer("⚠️ Polymarket is unavailable right now. Please try again in a minute.")
+        return
     
     if not markets:
         await message.answer("❌ No markets found.")
@@ -51,10 +56,10 @@ async def process_url(message: types.Message, state: FSMContext):
 
     kb = InlineKeyboardBuilder()
     for m in markets[:10]:
-        q_text = m.get('question', 'Unknown Market')
+        q_text = m.question or 'Unknown Market'
         if len(q_text) > 40:
             q_text = q_text[:37] + "..."
-        m_id = m.get('id')
+        m_id = m.id
         kb.button(text=q_text, callback_data=f"sel_mkt:{m_id}")
     
     kb.adjust(1)
@@ -129,10 +134,13 @@ async def condition_handler(callback: types.CallbackQuery, state: FSMContext):
     price = data['price']
     outcome = data['outcome']
 
-    market_info = await poly_api.get_market_data(market_id)
-    market_name = market_info.get('question') if market_info else f"Market {market_id}"
+    try:
+        market_info = await poly_api.get_market_data(market_id, interactive=True)
+    except UpstreamError:
+        market_info = None
+    market_name = market_info.question if market_info else f"Market {market_id}"
     
-    await db.add_to_watchlist(
+    alert_id = await db.add_to_watchlist(
         callback.from_user.id, 
         market_id, 
         market_name, 
@@ -140,6 +148,7 @@ async def condition_handler(callback: types.CallbackQuery, state: FSMContext):
         condition,
         outcome
     )
+    registry.add_alert(await db.get_alert_by_id(alert_id))
     
     cents_display = f"{price*100:.1f}"
     emoji = "🟩" if outcome == "YES" else "🟥"
@@ -219,19 +228,12 @@ async def view_alert_handler(callback: types.CallbackQuery):
 
     current_price_str = "⏳..."
     try:
-        m_data = await poly_api.get_market_data(alert['market_id'])
-        if m_data:
-            outcomes = m_data.get('outcomePrices', [])
-            if isinstance(outcomes, str):
-                outcomes = json.loads(outcomes)
-            
-            if outcomes:
-                p_yes = float(outcomes[0])
-                if alert['outcome'] == 'YES':
-                    curr = p_yes
-                else:
-                    curr = float(outcomes[1]) if len(outcomes) > 1 else (1.0 - p_yes)
-                current_price_str = f"{curr*100:.1f}¢"
+        m_data = await poly_api.get_market_data(alert['market_id'], interactive=True)
+        curr = feed.outcome_price(m_data, alert['outcome']) if m_data else None
+        if curr is not None:
+            current_price_str = f"{curr*100:.1f}¢"
+    except UpstreamError:
+        current_price_str = "⚠️ Polymarket unavailable"
     except Exception:
         current_price_str = "⚠️ Error"
 
@@ -268,6 +270,7 @@ async def toggle_alert_condition(callback: types.CallbackQuery):
 
     new_cond = "BELOW" if alert['condition'] == "ABOVE" else "ABOVE"
     await db.update_alert(a_id, alert['alert_price'], new_cond, alert['outcome'])
+    registry.update_alert(a_id, alert['alert_price'], new_cond, alert['outcome'])
     await view_alert_handler(callback)
 
 @router.callback_query(F.data.startswith("tog_a_out:"))
@@ -278,6 +281,7 @@ async def toggle_alert_outcome(callback: types.CallbackQuery):
 
     new_out = "NO" if alert['outcome'] == "YES" else "YES"
     await db.update_alert(a_id, alert['alert_price'], alert['condition'], new_out)
+    registry.update_alert(a_id, alert['alert_price'], alert['condition'], new_out)
     await view_alert_handler(callback)
 
 @router.callback_query(F.data.startswith("edit_a_price:"))
@@ -311,6 +315,7 @@ async def process_edit_price(message: types.Message, state: FSMContext):
         alert = await db.get_alert_by_id(a_id)
         if alert:
             await db.update_alert(a_id, new_price, alert['condition'], alert['outcome'])
+            registry.update_alert(a_id, new_price, alert['condition'], alert['outcome'])
             
             kb = InlineKeyboardBuilder()
             kb.button(text="🔙 Back to Alert", callback_data=f"view_a:{a_id}")
@@ -329,6 +334,7 @@ async def process_edit_price(message: types.Message, state: FSMContext):
 @router.callback_query(F.data.startswith("del_a:"))
 async def delete_alert_handler(callback: types.CallbackQuery):
     a_id = int(callback.data.split(":")[1])
-    await db.delete_alert(a_id, callback.from_user.id)
+    if await db.delete_alert(a_id, callback.from_user.id):
+        registry.remove_alert(a_id)
     await callback.answer("🗑 Alert deleted")
     await list_alerts_handler(callback)
\ No newline at end of file
@@ -4,7 +4,8 @@ from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import StatesGroup, State
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from database.database import db
-from services.api import poly_api
+from services.api import poly_api, UpstreamError
+from services.registry import registry
 
 router = Router()
 
@@ -52,7 +53,8 @@ async def process_alias(message: types.Message, state: FSMContext):
     data = await state.get_data()
     address = data['address']
 
-    await db.add_wallet(message.from_user.id, address, alias)
+    wallet_id = await db.add_wallet(message.from_user.id, address, alias)
+    registry.add_wallet(await db.get_wallet_by_id(wallet_id))
     await message.answer(f"✅ Wallet <b>{alias}</b> added!", parse_mode="HTML")
     await state.clear()
 
@@ -110,7 +112,12 @@ async def view_wallet_handler(callback: types.CallbackQuery):
         await callback.answer("Wallet not found", show_alert=True)
         return
 
-    positions = await poly_api.get_wallet_positions(wallet['wallet_address'])
+    try:
+        positions = await poly_api.get_wallet_positions(wallet['wallet_address'], interactive=True)
+        upstream_down = False
+    except UpstreamError:
+        positions = []
+        upstream_down = True
     
     text = f"👤 <b>{wallet['alias']}</b>\n"
     text += f"<code>{wallet['wallet_address']}</code>\n\n"
@@ -134,6 +141,8 @@ async def view_wallet_handler(callback: types.CallbackQuery):
             
             text += f"• {title[:35]}...\n"
             text += f"  {outcome} | {size:.0f} sh | <b>${value:.2f}</b>\n\n"
+    elif upstream_down:
+        text += "⚠️ Polymarket is unavailable right now, positions could not be loaded."
     else:
         text += "📭 No active positions found."
 
@@ -180,6 +189,10 @@ async def toggle_new_markets(callback: types.CallbackQuery):
         w_id, wallet['min_vol'], wallet['price_target'], 
         wallet['price_cond'], new_val
     )
+    registry.update_wallet_settings(
+        w_id, wallet['min_vol'], wallet['price_target'], 
+        wallet['price_cond'], new_val
+    )
     await settings_wallet_handler(callback)
 
 @router.callback_query(F.data.startswith("set_vol:"))
@@ -202,6 +215,10 @@ async def process_min_vol(message: types.Message, state: FSMContext):
             w_id, vol, wallet['price_target'], 
             wallet['price_cond'], wallet['notify_new_markets']
         )
+        registry.update_wallet_settings(
+            w_id, vol, wallet['price_target'], 
+            wallet['price_cond'], wallet['notify_new_markets']
+        )
         await message.answer("✅ Minimum volume updated.")
         await state.clear()
     except ValueError:
@@ -231,6 +248,9 @@ async def process_price_cond(callback: types.CallbackQuery, state: FSMContext):
         await db.update_wallet_settings(
             w_id, wallet['min_vol'], 0, "NONE", wallet['notify_new_markets']
         )
+        registry.update_wallet_settings(
+            w_id, wallet['min_vol'], 0, "NONE", wallet['notify_new_markets']
+        )
         await callback.message.answer("✅ Price filter disabled.")
         await state.clear()
         return
@@ -256,6 +276,9 @@ async def process_price_val(message: types.Message, state: FSMContext):
         await db.update_wallet_settings(
             w_id, wallet['min_vol'], val, cond, wallet['notify_new_markets']
         )
+        registry.update_wallet_settings(
+            w_id, wallet['min_vol'], val, cond, wallet['notify_new_markets']
+        )
         await message.answer(f"✅ Price filter set: {cond} {val}")
         await state.clear()
     except ValueError:
@@ -267,6 +290,7 @@ async def delete_wallet_handler(callback: types.CallbackQuery):
     success = await db.delete_wallet(w_id, callback.from_user.id)
     
     if success:
+        registry.remove_wallet(w_id)
         await callback.answer("✅ Wallet deleted")
         await list_wallets_handler(callback)
     else:
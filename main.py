@@ -9,12 +9,20 @@ from aiogram.enums import ParseMode
 from config.config import config
 from database.database import db
 from handlers import common, markets, wallets
+from services.api import poly_api
 from services.background import start_background_tasks
+from services.feed import feed
+from services.market_snapshot import market_snapshots
+from services.notifier import notifier
+from services.registry import registry
 
 logging.basicConfig(level=logging.INFO, stream=sys.stdout)
 
 async def main():
+    await db.connect()
     await db.create_tables()
+    await registry.load()
+    await poly_api.start()
     
     bot = Bot(token=config.BOT_TOKEN, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
     dp = Dispatcher()
@@ -23,11 +31,18 @@ async def main():
     dp.include_router(markets.router)
     dp.include_router(wallets.router)
 
-    await start_background_tasks(bot)
-
-    logging.info("Bot is starting...")
-    await bot.delete_webhook(drop_pending_updates=True)
-    await dp.start_polling(bot)
+    try:
+        await start_background_tasks(bot)
+
+        logging.info("Bot is starting...")
+        await bot.delete_webhook(drop_pending_updates=True)
+        await dp.start_polling(bot)
+    finally:
+        await market_snapshots.stop()
+        await feed.stop()
+        await notifier.stop()
+        await poly_api.close()
+        await db.close()
 
 if __name__ == "__main__":
     if sys.platform == 'win32':
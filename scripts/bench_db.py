@@ -0,0 +1,91 @@
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.database import Database
+
+async def populate(db, rows, users):
+    rnd = random.Random(42)
+    async with db.get_writer() as conn:
+        await conn.executemany(
+            "INSERT INTO users (user_id, username, arb_alerts, alert_markets, alert_events) VALUES (?, ?, ?, ?, ?)",
+            (
+                (uid, f"user{uid}", int(rnd.random() < 0.02), int(rnd.random() < 0.01), int(rnd.random() < 0.05))
+                for uid in range(users)
+            )
+        )
+        await conn.executemany(
+            "INSERT INTO watchlist (user_id, market_id, market_slug, alert_price, condition, outcome) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (rnd.randrange(users), str(rnd.randrange(20000)), "slug", rnd.random(), "ABOVE", "YES")
+                for _ in range(rows)
+            )
+        )
+        await conn.executemany(
+            "INSERT INTO tracked_wallets (user_id, wallet_address, alias) VALUES (?, ?, ?)",
+            (
+                (rnd.randrange(users), f"0x{rnd.getrandbits(160):040x}", "whale")
+                for _ in range(rows)
+            )
+        )
+        await conn.commit()
+
+async def measure(db, users, iterations):
+    rnd = random.Random(7)
+    queries = [
+        ("get_user_watchlist", lambda: db.get_user_watchlist(rnd.randrange(users))),
+        ("get_user_wallets", lambda: db.get_user_wallets(rnd.randrange(users))),
+        ("get_users_for_arb", db.get_users_for_arb),
+        ("get_users_for_markets", db.get_users_for_markets),
+        ("get_users_for_events", db.get_users_for_events),
+    ]
+    results = {}
+    for name, query in queries:
+        samples = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            await query()
+            samples.append((time.perf_counter() - started) * 1000)
+        samples.sort()
+        results[name] = (statistics.median(samples), samples[int(len(samples) * 0.95) - 1])
+    return results
+
+async def main():
+    parser = argparse.ArgumentParser(description="Query latency with and without the v3 schema indexes")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="watchlist and tracked_wallets rows")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"))
+        await db.connect()
+        await db.create_tables(target_version=2)
+
+        started = time.perf_counter()
+        await populate(db, args.rows, args.users)
+        print(f"Populated {args.rows:,} rows per table, {args.users:,} users in {time.perf_counter() - started:.1f}s")
+
+        before = await measure(db, args.users, args.iterations)
+
+        started = time.perf_counter()
+        await db.create_tables()
+        print(f"Built indexes in {time.perf_counter() - started:.1f}s\n")
+
+        after = await measure(db, args.users, args.iterations)
+        await db.close()
+
+    print(f"{'query':<24}{'no index p50/p95 ms':>24}{'indexed p50/p95 ms':>24}{'speedup':>10}")
+    for name, (p50, p95) in before.items():
+        i50, i95 = after[name]
+        print(f"{name:<24}{p50:>13.3f} / {p95:<8.3f}{i50:>13.3f} / {i95:<8.3f}{p50 / i50:>9.1f}x")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from aiohttp import web
+
+# Offline stand-in for the CLOB market channel, run the bot with
+# FEED_URL=ws://127.0.0.1:8765/ws/market to stream random-walk prices.
+
+class FakeMarket:
+    def __init__(self, volatility, seed):
+        self.rnd = random.Random(seed)
+        self.volatility = volatility
+        self.mids = {}
+
+    def mid(self, asset_id):
+        if asset_id not in self.mids:
+            self.mids[asset_id] = round(self.rnd.uniform(0.1, 0.9), 3)
+        return self.mids[asset_id]
+
+    def step(self, asset_id):
+        mid = self.mid(asset_id) + self.rnd.gauss(0, self.volatility)
+        self.mids[asset_id] = min(0.99, max(0.01, round(mid, 3)))
+        return self.mids[asset_id]
+
+    def quote(self, asset_id, mid):
+        half = 0.005
+        return {
+            "asset_id": asset_id,
+            "best_bid": f"{max(0.0, mid - half):.3f}",
+            "best_ask": f"{min(1.0, mid + half):.3f}",
+        }
+
+    def book(self, asset_id):
+        mid = self.mid(asset_id)
+        return {
+            "event_type": "book",
+            "asset_id": asset_id,
+            "market": "0xfake",
+            "bids": [{"price": f"{mid - 0.005 - i / 100:.3f}", "size": "100"} for i in range(3)],
+            "asks": [{"price": f"{mid + 0.005 + i / 100:.3f}", "size": "100"} for i in range(3)],
+            "timestamp": str(int(time.time() * 1000)),
+        }
+
+async def market_channel(request):
+    args = request.app["args"]
+    market = request.app["market"]
+    ws = web.WebSocketResponse()
+    await ws.prepare(request)
+    request.app["sockets"].add(ws)
+    assets = set()
+
+    async def publish():
+        while not ws.closed:
+            await asyncio.sleep(args.interval)
+            if not assets:
+                continue
+            changes = [market.quote(a, market.step(a)) for a in market.rnd.sample(sorted(assets), min(args.batch, len(assets)))]
+            await ws.send_str(json.dumps({
+                "event_type": "price_change",
+                "market": "0xfake",
+                "price_changes": changes,
+                "timestamp": str(int(time.time() * 1000)),
+            }))
+
+    publisher = asyncio.create_task(publish())
+    try:
+        async for msg in ws:
+            if msg.type != web.WSMsgType.TEXT:
+                continue
+            if msg.data == "PING":
+                await ws.send_str("PONG")
+                continue
+            payload = json.loads(msg.data)
+            ids = set(payload.get("assets_ids") or ())
+            if payload.get("operation") == "unsubscribe":
+                assets -= ids
+                continue
+            assets |= ids
+            await ws.send_str(json.dumps([market.book(a) for a in sorted(ids)]))
+            print(f"subscribed to {len(ids)} assets, {len(assets)} total")
+    finally:
+        publisher.cancel()
+        request.app["sockets"].discard(ws)
+    return ws
+
+async def close_sockets(app):
+    for ws in list(app["sockets"]):
+        await ws.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Polymarket CLOB market WebSocket")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between price_change messages")
+    parser.add_argument("--batch", type=int, default=20, help="assets moved per message")
+    parser.add_argument("--volatility", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    app = web.Application()
+    app["args"] = args
+    app["market"] = FakeMarket(args.volatility, args.seed)
+    app["sockets"] = set()
+    app.on_shutdown.append(close_sockets)
+    app.router.add_get("/ws/market", market_channel)
+    web.run_app(app, host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
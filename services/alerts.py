@@ -0,0 +1,102 @@
+import bisect
+
+class ThresholdBook:
+    __slots__ = ("above_prices", "above_ids", "below_prices", "below_ids")
+
+    def __init__(self):
+        self.above_prices = []
+        self.above_ids = []
+        self.below_prices = []
+        self.below_ids = []
+
+    def _side(self, condition):
+        if condition == 'ABOVE':
+            return self.above_prices, self.above_ids
+        return self.below_prices, self.below_ids
+
+    def add(self, alert_id, price, condition):
+        prices, ids = self._side(condition)
+        pos = bisect.bisect_right(prices, price)
+        prices.insert(pos, price)
+        ids.insert(pos, alert_id)
+
+    def remove(self, alert_id, price, condition):
+        prices, ids = self._side(condition)
+        pos = bisect.bisect_left(prices, price)
+        while pos < len(prices) and prices[pos] == price:
+            if ids[pos] == alert_id:
+                del prices[pos]
+                del ids[pos]
+                return True
+            pos += 1
+        return False
+
+    def triggered(self, price):
+        # ABOVE fires for every threshold <= price, BELOW for every threshold >= price
+        fired = self.above_ids[:bisect.bisect_right(self.above_prices, price)]
+        fired += self.below_ids[bisect.bisect_left(self.below_prices, price):]
+        return fired
+
+    def distance(self, price):
+        # how far price has to move before the next alert fires, None when nothing is left
+        nearest = None
+        pos = bisect.bisect_right(self.above_prices, price)
+        if pos < len(self.above_prices):
+            nearest = self.above_prices[pos] - price
+        pos = bisect.bisect_left(self.below_prices, price)
+        if pos > 0:
+            gap = price - self.below_prices[pos - 1]
+            nearest = gap if nearest is None else min(nearest, gap)
+        return nearest
+
+    def __len__(self):
+        return len(self.above_ids) + len(self.below_ids)
+
+class AlertIndex:
+    def __init__(self):
+        self.books = {}
+        self.changed = set()
+
+    def add(self, alert_id, market_id, outcome, price, condition):
+        self.changed.add(str(market_id))
+        outcomes = self.books.setdefault(str(market_id), {})
+        book = outcomes.get(outcome)
+        if book is None:
+            book = outcomes[outcome] = ThresholdBook()
+        book.add(alert_id, price, condition)
+
+    def remove(self, alert_id, market_id, outcome, price, condition):
+        market_id = str(market_id)
+        outcomes = self.books.get(market_id)
+        if not outcomes or outcome not in outcomes:
+            return False
+
+        book = outcomes[outcome]
+        removed = book.remove(alert_id, price, condition)
+        if not book:
+            del outcomes[outcome]
+            if not outcomes:
+                del self.books[market_id]
+        return removed
+
+    def drain_changed(self):
+        changed, self.changed = self.changed, set()
+        return changed
+
+    def market_ids(self):
+        return list(self.books.keys())
+
+    def outcomes(self, market_id):
+        return list(self.books.get(str(market_id), {}).keys())
+
+    def triggered(self, market_id, outcome, price):
+        book = self.books.get(str(market_id), {}).get(outcome)
+        if book is None:
+            return []
+        return book.triggered(price)
+
+    def distance(self, market_id, outcome, price):
+        book = self.books.get(str(market_id), {}).get(outcome)
+        if book is None:
+            return None
+        return book.distance(price)
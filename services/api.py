@@ -1,32 +1,247 @@
 import aiohttp
+import asyncio
 import logging
+import random
 import re
-import json
 from config.config import config
+from services.breaker import CircuitBreaker, UpstreamError
+from services.cache import ResponseCache
+from services.models import loads, parse_book, parse_events, parse_market, parse_markets
+from services.ratelimit import HostLimiter
 
 logger = logging.getLogger(__name__)
 
+# connect / read budgets per attempt; the subgraph is noticeably slower to answer
+TIMEOUTS = {
+    "gamma": aiohttp.ClientTimeout(total=10, connect=3, sock_read=8),
+    "data": aiohttp.ClientTimeout(total=10, connect=3, sock_read=8),
+    "graph": aiohttp.ClientTimeout(total=20, connect=3, sock_read=15),
+    "clob": aiohttp.ClientTimeout(total=5, connect=2, sock_read=4),
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# background requests per second per upstream; interactive calls get INTERACTIVE_RATE on top
+RATE_LIMITS = {
+    "gamma": config.GAMMA_RATE,
+    "data": config.DATA_RATE,
+    "graph": config.GRAPH_RATE,
+    "clob": config.CLOB_RATE,
+}
+
+# seconds a cached response is served without asking upstream; 0 still keeps the ETag for revalidation
+CACHE_TTLS = {
+    "market": 15,
+    "markets": 5,
+    "event": 60,
+    "listing": 0,
+    "positions": 30,
+    "universe": 20,
+    "book": 2,
+}
+
 class PolymarketAPI:
     def __init__(self):
         self.gamma_url = "https://gamma-api.polymarket.com"
         self.data_url = "https://data-api.polymarket.com"
         self.graph_url = "https://api.thegraph.com/subgraphs/name/polymarket/matic-markets-7"
+        self.clob_url = "https://clob.polymarket.com"
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
+        self.session = None
+        self.cache = ResponseCache(config.CACHE_MAX_BYTES)
+        self.inflight = {}
+        self.coalesced = 0
+        self.breakers = {
+            name: CircuitBreaker(name, config.BREAKER_THRESHOLD, config.BREAKER_RESET)
+            for name in TIMEOUTS
+        }
+        self.limiters = {
+            name: HostLimiter(rate, config.INTERACTIVE_RATE)
+            for name, rate in RATE_LIMITS.items()
+        }
 
-    async def get_market_data(self, market_id: str):
-        url = f"{self.gamma_url}/markets/{market_id}"
-        async with aiohttp.ClientSession(headers=self.headers) as session:
+    async def start(self):
+        if self.session and not self.session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=config.HTTP_POOL_LIMIT,
+            limit_per_host=config.HTTP_POOL_PER_HOST,
+            ttl_dns_cache=config.HTTP_DNS_TTL,
+            keepalive_timeout=config.HTTP_KEEPALIVE,
+            enable_cleanup_closed=True,
+        )
+        self.session = aiohttp.ClientSession(
+            headers=self.headers,
+            connector=connector,
+            timeout=TIMEOUTS["gamma"],
+        )
+
+    async def close(self):
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    async def _get_session(self):
+        if not self.session or self.session.closed:
+            await self.start()
+        return self.session
+
+    async def _get_json(self, url, endpoint, params=None, interactive=False, upstream="gamma", parse=None):
+        key = ("GET", url, tuple(params) if params else ())
+        entry = self.cache.get(key)
+        if entry is not None and entry.fresh:
+            self.cache.hits += 1
+            return entry.data
+        if entry is not None and interactive and entry.usable:
+            self.cache.stale_hits += 1
+            started = key not in self.inflight
+            refresh = self._flight(key, lambda: self._fetch_json(url, endpoint, params, upstream, key, parse))
+            if started:
+                refresh.add_done_callback(self._refreshed)
+            return entry.data
+        self.cache.misses += 1
+        return await self._shared(key, lambda: self._fetch_json(url, endpoint, params, upstream, key, parse, interactive))
+
+    def _flight(self, key, factory):
+        task = self.inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return task
+        task = asyncio.create_task(factory())
+        self.inflight[key] = task
+        task.add_done_callback(lambda _: self.inflight.pop(key, None))
+        return task
+
+    def _refreshed(self, task):
+        # nobody awaits a stale-while-revalidate refresh, so its failure is only worth a log line
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background cache refresh failed: {task.exception()}")
+
+    async def _shared(self, key, factory):
+        # shielded so one caller timing out does not cancel the request for everyone else
+        return await asyncio.shield(self._flight(key, factory))
+
+    async def _post_graph(self, query, variables):
+        key = ("POST", self.graph_url, query, tuple(sorted(variables.items())))
+        return await self._shared(key, lambda: self._fetch_graph(query, variables))
+
+    async def _fetch_graph(self, query, variables):
+        status, _, body = await self._request("graph", "POST", self.graph_url, False, json={'query': query, 'variables': variables})
+        if status != 200:
+            return None
+        return await self._decode("graph", body)
+
+    async def _request(self, upstream, method, url, interactive, **kwargs):
+        # every call made through here is a read, so it is safe to retry
+        breaker = self.breakers[upstream]
+        limiter = self.limiters[upstream]
+        session = await self._get_session()
+        error = None
+        for attempt in range(config.HTTP_RETRIES + 1):
+            if attempt:
+                await asyncio.sleep(self._backoff(attempt))
+            if interactive and limiter.paused_for(interactive) > config.HTTP_BACKOFF_MAX:
+                raise UpstreamError(upstream, "rate limited")
+            probe = breaker.check()
             try:
-                async with session.get(url) as resp:
-                    if resp.status == 200:
-                        return await resp.json()
-            except Exception:
-                return None
-        return None
-
-    async def get_markets_by_url(self, link: str):
+                await limiter.acquire(interactive)
+                async with session.request(method, url, timeout=TIMEOUTS[upstream], **kwargs) as resp:
+                    if resp.status not in RETRY_STATUSES:
+                        body = await resp.read() if resp.status == 200 else b""
+                        breaker.record_success()
+                        return resp.status, resp.headers.get("ETag"), body
+                    if resp.status == 429:
+                        error = UpstreamError(upstream, "HTTP 429", resp.headers.get("Retry-After", "1"))
+                    else:
+                        error = UpstreamError(upstream, f"HTTP {resp.status}")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = UpstreamError(upstream, str(e) or type(e).__name__)
+            finally:
+                if probe:
+                    breaker.release()
+            logger.warning(f"{method} {url} failed (attempt {attempt + 1}): {error.reason}")
+            if error.retry_after is None:
+                breaker.record_failure()
+                continue
+            # rate limited rather than down: slow every caller of this host instead of tripping the breaker
+            wait = self._retry_after(error)
+            limiter.backoff(min(wait, config.HTTP_RETRY_AFTER_MAX))
+            if wait > config.HTTP_BACKOFF_MAX:
+                # longer than any caller should sit in the retry loop
+                raise error
+        raise error
+
+    def _backoff(self, attempt):
+        return random.uniform(0, min(config.HTTP_BACKOFF_MAX, config.HTTP_BACKOFF_BASE * 2 ** attempt))
+
+    def _retry_after(self, error):
+        if error.retry_after.isdigit():
+            return float(error.retry_after)
+        return 1.0
+
+    async def _decode(self, upstream, body, parse=None):
+        # big listing pages take tens of milliseconds to decode, keep that off the event loop
+        if len(body) >= config.JSON_THREAD_THRESHOLD:
+            return await asyncio.to_thread(self._parse, upstream, body, parse)
+        return self._parse(upstream, body, parse)
+
+    def _parse(self, upstream, body, parse):
+        try:
+            data = loads(body)
+        except ValueError as e:
+            raise UpstreamError(upstream, f"invalid JSON: {e}")
+        return parse(data) if parse else data
+
+    async def _fetch_json(self, url, endpoint, params, upstream, key, parse, interactive=False):
+        ttl = CACHE_TTLS[endpoint]
+        entry = self.cache.get(key)
+        headers = {"If-None-Match": entry.etag} if entry is not None and entry.etag else None
+        status, etag, body = await self._request(upstream, "GET", url, interactive, params=params, headers=headers)
+        if status == 304 and entry is not None:
+            entry.touch(ttl, config.CACHE_STALE_TTL)
+            self.cache.revalidated += 1
+            return entry.data
+        if status != 200:
+            return None
+        data = await self._decode(upstream, body, parse)
+        self.cache.put(key, data, etag, len(body), ttl, config.CACHE_STALE_TTL)
+        return data
+
+    async def get_market_data(self, market_id: str, interactive=False):
+        url = f"{self.gamma_url}/markets/{market_id}"
+        return await self._get_json(url, "market", interactive=interactive, parse=parse_market)
+
+    async def get_markets_by_ids(self, market_ids, chunk_size=50):
+        ids = list(dict.fromkeys(str(m) for m in market_ids))
+        chunks = [ids[i:i + chunk_size] for i in range(0, len(ids), chunk_size)]
+        results = await asyncio.gather(*(self._get_markets_chunk(c) for c in chunks), return_exceptions=True)
+
+        # ids of failed batches come back separately, they are unknown rather than gone
+        markets = {}
+        failed = []
+        errors = []
+        for ids_chunk, chunk in zip(chunks, results):
+            if isinstance(chunk, BaseException):
+                errors.append(chunk)
+                failed.extend(ids_chunk)
+                continue
+            for m in chunk:
+                markets[m.id] = m
+        if errors:
+            # partial data is still useful; only fail when nothing came back
+            if len(errors) == len(results):
+                raise errors[0]
+            logger.warning(f"{len(errors)} of {len(results)} market batches failed: {errors[0]}")
+        return markets, failed
+
+    async def _get_markets_chunk(self, ids):
+        params = [("id", i) for i in ids] + [("limit", str(len(ids)))]
+        url = f"{self.gamma_url}/markets"
+        return await self._get_json(url, "markets", params=params, parse=parse_markets) or []
+
+    async def get_markets_by_url(self, link: str, interactive=False):
         slug_match = re.search(r'polymarket\.com/event/([^/?]+)', link)
         if not slug_match:
             return []
@@ -34,50 +249,19 @@ class PolymarketAPI:
         event_slug = slug_match.group(1)
         url = f"{self.gamma_url}/events?slug={event_slug}"
         
-        async with aiohttp.ClientSession(headers=self.headers) as session:
-            try:
-                async with session.get(url) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        if isinstance(data, list) and len(data) > 0:
-                            return data[0].get('markets', [])
-                        elif isinstance(data, dict):
-                            return data.get('markets', [])
-            except Exception:
-                return []
-        return []
+        events = await self._get_json(url, "event", interactive=interactive, parse=parse_events)
+        return events[0].markets if events else []
 
-    async def get_recent_markets(self):
-        url = f"{self.gamma_url}/markets?limit=1000&active=true&closed=false&order=createdAt&ascending=false"
-        async with aiohttp.ClientSession(headers=self.headers) as session:
-            try:
-                async with session.get(url) as resp:
-                    if resp.status == 200:
-                        return await resp.json()
-            except Exception:
-                return []
-        return []
+    async def get_recent_events(self, limit=1000, offset=0):
+        url = f"{self.gamma_url}/events?limit={limit}&offset={offset}&active=true&closed=false&order=createdAt&ascending=false"
+        return await self._get_json(url, "listing", parse=parse_events) or []
 
-    async def get_recent_events(self):
-        url = f"{self.gamma_url}/events?limit=1000&active=true&closed=false&order=createdAt&ascending=false"
-        async with aiohttp.ClientSession(headers=self.headers) as session:
-            try:
-                async with session.get(url) as resp:
-                    if resp.status == 200:
-                        return await resp.json()
-            except Exception:
-                return []
-        return []
+    async def get_wallets_activity(self, addresses):
+        addresses = list(dict.fromkeys(a.lower() for a in addresses))
+        if not addresses:
+            return {}
 
-    async def get_wallet_activity(self, address: str):
-        query = """
-        query GetTrades($user: String!) {
-            fpmmTrades(
-                first: 5, 
-                orderBy: creationTimestamp, 
-                orderDirection: desc, 
-                where: {creator: $user}
-            ) {
+        fields = """
                 id
                 type
                 outcomeIndex
@@ -90,71 +274,43 @@ class PolymarketAPI:
                     question
                     slug
                 }
-            }
-        }
         """
-        variables = {"user": address.lower()}
-        async with aiohttp.ClientSession(headers=self.headers) as session:
-            try:
-                async with session.post(
-                    self.graph_url, 
-                    json={'query': query, 'variables': variables}
-                ) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        if 'data' in data and 'fpmmTrades' in data['data']:
-                            return data['data']['fpmmTrades']
-            except Exception:
-                return []
-        return []
+        params = ", ".join(f"$u{i}: String!" for i in range(len(addresses)))
+        selections = "".join(
+            f"""
+            w{i}: fpmmTrades(
+                first: 5,
+                orderBy: creationTimestamp,
+                orderDirection: desc,
+                where: {{creator: $u{i}}}
+            ) {{{fields}}}"""
+            for i in range(len(addresses))
+        )
+        query = f"query GetTradesBatch({params}) {{{selections}\n        }}"
+        variables = {f"u{i}": a for i, a in enumerate(addresses)}
 
-    async def get_wallet_positions(self, address: str):
+        data = await self._post_graph(query, variables)
+        if data is None:
+            return {}
+        data = data.get('data') or {}
+        return {a: data.get(f"w{i}") or [] for i, a in enumerate(addresses)}
+
+    async def get_wallet_positions(self, address: str, interactive=False):
         url = f"{self.data_url}/positions?user={address}&sizeThreshold=0.1&limit=20&sortBy=CURRENT_ASSET_VALUE&sortDirection=DESC"
         
-        async with aiohttp.ClientSession(headers=self.headers) as session:
-            try:
-                async with session.get(url) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        if isinstance(data, list):
-                            return data
-                        elif isinstance(data, dict) and 'data' in data:
-                            return data['data']
-            except Exception as e:
-                logger.error(f"Error fetching positions: {e}")
+        data = await self._get_json(url, "positions", interactive=interactive, upstream="data")
+        if isinstance(data, list):
+            return data
+        elif isinstance(data, dict) and 'data' in data:
+            return data['data']
         return []
 
-    async def check_arbitrage(self):
-        url = f"{self.gamma_url}/markets?active=true&closed=false&limit=100&order=volume&ascending=false"
-        async with aiohttp.ClientSession(headers=self.headers) as session:
-            try:
-                async with session.get(url) as resp:
-                    if resp.status == 200:
-                        markets = await resp.json()
-                        opportunities = []
-                        for m in markets:
-                            try:
-                                outcomes = json.loads(m.get('outcomePrices', '[]'))
-                                if len(outcomes) == 2:
-                                    price_yes = float(outcomes[0])
-                                    price_no = float(outcomes[1])
-                                    total = price_yes + price_no
-                                    if 0.5 < total < 0.985: 
-                                        profit = (1.0 - total) * 100
-                                        opportunities.append({
-                                            "id": m.get('id'),
-                                            "question": m.get('question'),
-                                            "profit": profit,
-                                            "profit_str": f"{profit:.2f}%",
-                                            "yes": price_yes,
-                                            "no": price_no,
-                                            "url": f"https://polymarket.com/market/{m.get('slug')}"
-                                        })
-                            except:
-                                continue
-                        return sorted(opportunities, key=lambda x: x['profit'], reverse=True)
-            except Exception:
-                return []
-        return []
+    async def get_active_markets(self, limit=500, offset=0, interactive=False):
+        url = f"{self.gamma_url}/markets?limit={limit}&offset={offset}&active=true&closed=false&order=id&ascending=true"
+        return await self._get_json(url, "universe", interactive=interactive, parse=parse_markets) or []
+
+    async def get_order_book(self, token_id, interactive=False):
+        url = f"{self.clob_url}/book?token_id={token_id}"
+        return await self._get_json(url, "book", interactive=interactive, upstream="clob", parse=parse_book)
 
 poly_api = PolymarketAPI()
\ No newline at end of file
@@ -0,0 +1,181 @@
+import asyncio
+import itertools
+import logging
+import time
+import numpy as np
+from config.config import config
+from services.api import poly_api
+from services.market_snapshot import market_snapshots
+
+logger = logging.getLogger(__name__)
+
+class PageVectors:
+    __slots__ = ("markets", "yes", "no", "events")
+
+    def __init__(self, markets):
+        n = len(markets)
+        nan = float('nan')
+        self.markets = markets
+        self.yes = np.fromiter((m.outcome_prices[0] if m.outcome_prices else nan for m in markets), float, n)
+        self.no = np.fromiter((m.outcome_prices[1] if len(m.outcome_prices) == 2 else nan for m in markets), float, n)
+        self.events = np.array([m.event_id if m.neg_risk else '' for m in markets], dtype=str)
+
+class ArbitrageEngine:
+    def __init__(self):
+        self.pages = {}
+        self.universe = 0
+        self.compute_ms = 0.0
+        self.screened = 0
+        self.confirmed = 0
+
+    async def scan(self, interactive=False, snapshot=None):
+        if snapshot is None:
+            snapshot = await market_snapshots.latest()
+        pages = snapshot.pages
+        started = time.perf_counter()
+        candidates = self.find(pages)
+        self.compute_ms = (time.perf_counter() - started) * 1000
+        opportunities = await self.confirm(candidates, interactive)
+        self.screened = len(candidates)
+        self.confirmed = len(opportunities)
+        logger.info(
+            f"Arbitrage scan over {self.universe} markets took {self.compute_ms:.1f}ms, "
+            f"{len(candidates)} candidates, {len(opportunities)} fillable"
+        )
+        return opportunities
+
+    async def confirm(self, candidates, interactive=False):
+        # mid prices only shortlist; the order books decide what can actually be filled
+        candidates = [c for c in candidates if c['tokens']][:config.ARB_CONFIRM_TOP]
+        tokens = list({t for c in candidates for t in c['tokens']})
+        results = await asyncio.gather(
+            *(poly_api.get_order_book(t, interactive) for t in tokens),
+            return_exceptions=True,
+        )
+        books = dict(zip(tokens, results))
+        failed = [r for r in results if isinstance(r, BaseException)]
+        if failed and len(failed) == len(results):
+            raise failed[0]
+        if failed:
+            logger.warning(f"{len(failed)} of {len(results)} order books failed: {failed[0]}")
+
+        confirmed = []
+        for opp in candidates:
+            legs = [books[t] for t in opp['tokens']]
+            if any(isinstance(b, BaseException) or b is None or not b.asks for b in legs):
+                continue
+            size, cost = fill_sets([b.asks for b in legs], config.ARB_MAX_TOTAL)
+            if size <= 0:
+                continue
+            best = [b.asks[0][0] for b in legs]
+            profit = (1.0 - cost / size) * 100
+            confirmed.append(opp | {
+                "profit": profit,
+                "profit_str": f"{profit:.2f}%",
+                "best_profit": (1.0 - sum(best)) * 100,
+                "yes": sum(best) if opp['kind'] == 'event' else best[0],
+                "no": None if opp['kind'] == 'event' else best[1],
+                "size": size,
+                "cost": cost,
+                "gain": size - cost,
+            })
+        return sorted(confirmed, key=lambda x: x['profit'], reverse=True)
+
+    def _vectorize(self, number, page):
+        # cached pages come back as the same list object, so their arrays can be reused as is
+        vectors = self.pages.get(number)
+        if vectors is None or vectors.markets is not page:
+            vectors = self.pages[number] = PageVectors(page)
+        return vectors
+
+    def find(self, pages):
+        vectors = [self._vectorize(i, page) for i, page in enumerate(pages)]
+        for stale in [n for n in self.pages if n >= len(pages)]:
+            del self.pages[stale]
+
+        markets = list(itertools.chain.from_iterable(v.markets for v in vectors))
+        self.universe = len(markets)
+        if not markets:
+            return []
+
+        yes = np.concatenate([v.yes for v in vectors])
+        no = np.concatenate([v.no for v in vectors])
+        events = np.concatenate([v.events for v in vectors])
+
+        opportunities = []
+
+        totals = yes + no
+        for i in np.flatnonzero((totals > 0.5) & (totals < config.ARB_MAX_TOTAL)):
+            m = markets[i]
+            opportunities.append(self._opportunity(
+                "binary", m.id, m.question, totals[i], 2,
+                f"https://polymarket.com/market/{m.slug}",
+                yes=float(yes[i]), no=float(no[i]),
+                tokens=m.token_ids if len(m.token_ids) == 2 else (),
+            ))
+
+        # negRisk events: exactly one market resolves YES, so buying every YES pays out 1.
+        # a market repeated across overlapping pages only raises the sum, so it can hide an
+        # opportunity but never invent one
+        grouped = np.flatnonzero(events != '')
+        if grouped.size:
+            event_ids, codes = np.unique(events[grouped], return_inverse=True)
+            prices = yes[grouped]
+            missing = np.isnan(prices)
+            sums = np.bincount(codes, weights=np.where(missing, 0.0, prices))
+            legs = np.bincount(codes)
+            gaps = np.bincount(codes, weights=missing)
+            first = np.empty(len(event_ids), dtype=np.intp)
+            first[codes[::-1]] = grouped[::-1]
+
+            viable = (legs >= 2) & (gaps == 0) & (sums > 0.5) & (sums < config.ARB_MAX_TOTAL)
+            for e in np.flatnonzero(viable):
+                m = markets[first[e]]
+                members = list({markets[i].id: markets[i] for i in grouped[codes == e]}.values())
+                tokens = tuple(member.token_ids[0] for member in members if member.token_ids)
+                opportunities.append(self._opportunity(
+                    "event", f"event:{event_ids[e]}", m.event_title or m.question, sums[e], len(members),
+                    f"https://polymarket.com/event/{m.event_slug}",
+                    yes=float(sums[e]), no=None,
+                    tokens=tokens if len(tokens) == len(members) else (),
+                ))
+
+        unique = {opp['id']: opp for opp in opportunities}
+        return sorted(unique.values(), key=lambda x: x['profit'], reverse=True)
+
+    def _opportunity(self, kind, opp_id, question, total, legs, url, yes, no, tokens):
+        profit = (1.0 - float(total)) * 100
+        return {
+            "kind": kind,
+            "id": opp_id,
+            "question": question,
+            "profit": profit,
+            "profit_str": f"{profit:.2f}%",
+            "yes": yes,
+            "no": no,
+            "legs": legs,
+            "url": url,
+            "tokens": tokens,
+        }
+
+def fill_sets(ladders, max_total):
+    # walk every leg's asks together, buying complete sets while one more set still costs less than max_total
+    levels = [0] * len(ladders)
+    left = [ladder[0][1] for ladder in ladders]
+    size = cost = 0.0
+    while True:
+        price = sum(ladder[level][0] for ladder, level in zip(ladders, levels))
+        if price >= max_total:
+            return size, cost
+        step = min(left)
+        size += step
+        cost += step * price
+        for k, ladder in enumerate(ladders):
+            left[k] -= step
+            if left[k] <= 1e-9:
+                levels[k] += 1
+                if levels[k] == len(ladder):
+                    return size, cost
+                left[k] = ladder[levels[k]][1]
+
+arbitrage = ArbitrageEngine()
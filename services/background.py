@@ -1,187 +1,301 @@
 import asyncio
 import logging
-import json
 import time
 from aiogram import Bot
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+from config.config import config
 from database.database import db
-from services.api import poly_api
+from services.api import poly_api, UpstreamError
+from services.arbitrage import arbitrage
+from services.feed import feed
+from services.market_snapshot import market_snapshots
+from services.scheduler import PollScheduler
+from services.notifier import notifier, PRIORITY_ALERT, PRIORITY_ARB, PRIORITY_LISTING
+from services.registry import registry
+from services.cursor import ListingCursor, fetch_new_listings
+from services.recorder import recorder
 
 logger = logging.getLogger(__name__)
 
 async def start_background_tasks(bot: Bot):
+    for user_id in await db.get_digest_users():
+        notifier.set_digest(user_id, True)
+    notifier.start(bot)
+    feed.start()
+    market_snapshots.start()
     asyncio.create_task(watch_prices(bot))
     asyncio.create_task(track_wallets(bot))
     asyncio.create_task(scanner_arbitrage(bot))
     asyncio.create_task(scanner_new_markets(bot))
+    asyncio.create_task(scanner_new_events(bot))
+
+watched_markets = {}
+alert_tasks = set()
+scheduler = PollScheduler(
+    config.PRICE_POLL_MIN,
+    config.PRICE_POLL_MAX,
+    config.PRICE_FAR_DISTANCE,
+    config.PRICE_POLL_STREAMING,
+)
 
 async def watch_prices(bot: Bot):
+    feed.on_price(on_feed_price)
+    feed_up = False
     while True:
+        due = []
         try:
-            alerts = await db.get_all_watchlists()
-            for alert in alerts:
-                market_data = await poly_api.get_market_data(alert['market_id'])
-                if not market_data: continue
-
-                try:
-                    outcome_prices = market_data.get('outcomePrices', [])
-                    if isinstance(outcome_prices, str):
-                        outcome_prices = json.loads(outcome_prices)
-                    
-                    if not outcome_prices: continue
-                        
-                    yes_price = float(outcome_prices[0])
-                    outcome_target = alert['outcome']
-                    
-                    if outcome_target == 'NO':
-                        if len(outcome_prices) > 1:
-                            current_price = float(outcome_prices[1])
-                        else:
-                            current_price = 1.0 - yes_price
-                    else:
-                        current_price = yes_price
-
-                except Exception:
-                    continue
-                
-                trigger = False
-                if alert['condition'] == 'ABOVE' and current_price >= alert['alert_price']:
-                    trigger = True
-                elif alert['condition'] == 'BELOW' and current_price <= alert['alert_price']:
-                    trigger = True
-                
-                if trigger:
-                    curr_cents = f"{current_price*100:.1f}"
-                    targ_cents = f"{alert['alert_price']*100:.1f}"
-                    emoji = "🟩" if outcome_target == "YES" else "🟥"
-                    arrow = "📈" if alert['condition'] == "ABOVE" else "📉"
-                    
-                    market_name = market_data.get('question', alert['market_slug'])
-                    
-                    kb = InlineKeyboardMarkup(inline_keyboard=[[
-                        InlineKeyboardButton(text="🔗 View Market", url=f"https://polymarket.com/market/{alert['market_slug']}")
-                    ]])
-
-                    try:
-                        await bot.send_message(
-                            alert['user_id'],
-                            f"🚨 <b>Price Alert!</b>\n\n"
-                            f"📊 {market_name}\n"
-                            f"{emoji} <b>{outcome_target}</b> Price: <b>{curr_cents}¢</b>\n"
-                            f"🎯 Target: {targ_cents}¢ ({arrow})",
-                            reply_markup=kb
-                        )
-                        await db.delete_alert(alert['id'], alert['user_id'])
-                    except Exception as e:
-                        logger.error(f"Failed to send alert: {e}")
-
+            index = registry.index
+            market_ids = index.market_ids()
+            scheduler.sync(market_ids)
+            # a new or edited alert may sit much closer to the price than the old schedule assumed
+            scheduler.expedite(index.drain_changed())
+            if feed_up and not feed.connected:
+                # polls were spaced out while prices streamed, REST has to take over right away
+                scheduler.expedite(market_ids)
+            feed_up = feed.connected
+            for market_id in watched_markets.keys() - set(market_ids):
+                del watched_markets[market_id]
+
+            due = scheduler.due(int(config.PRICE_POLL_BUDGET * config.PRICE_WATCH_TICK))
+            if due:
+                markets = {}
+                snapshot = market_snapshots.current
+                if snapshot is not None:
+                    markets = {
+                        m: snapshot.by_id[m] for m in due
+                        if m in snapshot.by_id and scheduler.accepts(m, snapshot.built_at)
+                    }
+                # fast schedules and markets outside the active universe still go to REST
+                missing = [m for m in due if m not in markets]
+                failed = set()
+                if missing:
+                    fetched, failed = await poly_api.get_markets_by_ids(missing)
+                    markets.update(fetched)
+                    failed = set(failed)
+                for market_id in due:
+                    if market_id in failed:
+                        continue
+                    market = markets.get(market_id)
+                    watched_markets[market_id] = market
+                    poll_market(market_id, market, index)
+                # a failed batch says nothing about its markets: keep the last data and try again soon
+                scheduler.retry(failed, config.PRICE_POLL_MIN * 2)
+                feed.watch(watched_assets(index))
+
+        except UpstreamError as e:
+            logger.warning(f"Price Watch skipped, Polymarket unavailable: {e}")
+            scheduler.retry(due, config.PRICE_POLL_MIN * 2)
         except Exception as e:
             logger.error(f"Price Watch Error: {e}")
+            scheduler.retry(due, config.PRICE_POLL_MIN * 2)
         
-        await asyncio.sleep(60)
+        await asyncio.sleep(config.PRICE_WATCH_TICK)
+
+def poll_market(market_id, market, index):
+    if not market:
+        scheduler.observe(market_id, None, None, None, False)
+        return
+
+    nearest = None
+    for outcome_target in index.outcomes(market_id):
+        current_price = market.outcome_price(outcome_target)
+        if current_price is None: continue
+        check_price(market_id, outcome_target, current_price)
+
+        distance = index.distance(market_id, outcome_target, current_price)
+        if distance is not None and (nearest is None or distance < nearest):
+            nearest = distance
+
+    # streamed markets only need REST as a consistency check
+    streaming = any(feed.price(token, config.FEED_STALE_AFTER) is not None for token in market.token_ids)
+    scheduler.observe(market_id, market.outcome_price('YES'), nearest, market.end_date, streaming)
+
+def watched_assets(index):
+    assets = {}
+    for market_id, market in watched_markets.items():
+        if not market: continue
+        for outcome_target in index.outcomes(market_id):
+            token_index = 1 if outcome_target == 'NO' else 0
+            if len(market.token_ids) > token_index:
+                assets[market.token_ids[token_index]] = (market_id, outcome_target)
+    return assets
+
+def on_feed_price(market_id, outcome, price):
+    check_price(market_id, outcome, price)
+
+def check_price(market_id, outcome, price):
+    market = watched_markets.get(market_id)
+    if not market:
+        return
+    for alert_id in registry.index.triggered(market_id, outcome, price):
+        alert = registry.remove_alert(alert_id)
+        if alert:
+            task = asyncio.create_task(send_price_alert(alert, market, price))
+            alert_tasks.add(task)
+            task.add_done_callback(alert_sent)
+
+def alert_sent(task):
+    alert_tasks.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.error(f"Price Alert Error: {task.exception()}")
+
+async def send_price_alert(alert, market, current_price):
+    outcome_target = alert.outcome
+    curr_cents = f"{current_price*100:.1f}"
+    targ_cents = f"{alert.alert_price*100:.1f}"
+    emoji = "🟩" if outcome_target == "YES" else "🟥"
+    arrow = "📈" if alert.condition == "ABOVE" else "📉"
+    
+    market_name = market.question or alert.market_slug
+    
+    kb = InlineKeyboardMarkup(inline_keyboard=[[
+        InlineKeyboardButton(text="🔗 View Market", url=f"https://polymarket.com/market/{alert.market_slug}")
+    ]])
+
+    notifier.send(
+        alert.user_id,
+        f"🚨 <b>Price Alert!</b>\n\n"
+        f"📊 {market_name}\n"
+        f"{emoji} <b>{outcome_target}</b> Price: <b>{curr_cents}¢</b>\n"
+        f"🎯 Target: {targ_cents}¢ ({arrow})",
+        priority=PRIORITY_ALERT,
+        reply_markup=kb
+    )
+    await db.delete_alert(alert.id, alert.user_id)
 
 async def track_wallets(bot: Bot):
     logger.info("Starting Wallet Tracker...")
+    semaphore = asyncio.Semaphore(config.WALLET_CONCURRENCY)
     while True:
+        started = time.monotonic()
+        subscribers = {}
         try:
-            wallets = await db.get_tracked_wallets()
-            for w in wallets:
-                trades = await poly_api.get_wallet_activity(w['wallet_address'])
-                
-                if not trades:
-                    continue
-
-                latest_trade = trades[0]
-                trade_id = latest_trade['id']
-                
-                if w['last_tx_hash'] != trade_id:
-                    await db.update_wallet_tx(w['id'], trade_id)
-                    
-                    if w['last_tx_hash'] is None:
-                        continue
-
-                    fpmm = latest_trade.get('fpmm', {})
-                    market_id = fpmm.get('id')
-                    market_slug = fpmm.get('slug', '')
-                    title = fpmm.get('question', 'Unknown Market')
-                    
-                    amount_usd = float(latest_trade.get('transactionAmount', 0))
-                    outcome_tokens = float(latest_trade.get('outcomeTokensTraded', 0))
-                    
-                    price_per_share = 0
-                    if outcome_tokens > 0:
-                        price_per_share = amount_usd / outcome_tokens
-
-                    if amount_usd < w['min_vol']:
-                        continue
-
-                    if w['price_cond'] != 'NONE':
-                        if w['price_cond'] == 'ABOVE' and price_per_share < w['price_target']:
-                            continue
-                        if w['price_cond'] == 'BELOW' and price_per_share > w['price_target']:
-                            continue
-
-                    seen_markets = json.loads(w['seen_markets']) if w['seen_markets'] else []
-                    is_new_market = market_id not in seen_markets
-
-                    if w['notify_new_markets'] and not is_new_market:
-                        continue
-                        
-                    if is_new_market and market_id:
-                        seen_markets.append(market_id)
-                        await db.update_wallet_seen_markets(w['id'], seen_markets)
-
-                    outcome_idx = latest_trade.get('outcomeIndex')
-                    trade_type = latest_trade.get('type')
-                    side = "YES" if outcome_idx == 0 else "NO"
-                    
-                    if trade_type == "Sell":
-                        action_emoji = "🔴"
-                        action_text = "SOLD"
-                    else:
-                        action_emoji = "🟢"
-                        action_text = "BOUGHT"
-                        
-                    header = "🆕 <b>New Market Entry!</b>" if is_new_market else "⚡ <b>New Trade Detected!</b>"
-                    
-                    kb = InlineKeyboardMarkup(inline_keyboard=[[
-                        InlineKeyboardButton(text="🔗 View Market", url=f"https://polymarket.com/market/{market_slug}"),
-                        InlineKeyboardButton(text="🔗 View TX", url=f"https://polygonscan.com/tx/{latest_trade['transactionHash']}")
-                    ]])
-                    
-                    msg = (
-                        f"🔭 <b>Wallet Tracker: {w['alias']}</b>\n\n"
-                        f"{header}\n"
-                        f"📜 {title}\n"
-                        f"{action_emoji} {action_text} <b>{side}</b>\n"
-                        f"💲 Price: {price_per_share:.3f}¢\n"
-                        f"💰 Amount: ${amount_usd:.2f}"
-                    )
-                    
-                    await bot.send_message(w['user_id'], msg, reply_markup=kb)
-                
-                await asyncio.sleep(2)
+            for w in list(registry.wallets.values()):
+                subscribers.setdefault(w.wallet_address.lower(), []).append(w)
 
+            addresses = list(subscribers)
+            size = config.WALLET_BATCH_SIZE
+            batches = [addresses[i:i + size] for i in range(0, len(addresses), size)]
+            await asyncio.gather(*(track_wallet_batch(bot, batch, subscribers, semaphore) for batch in batches))
         except Exception as e:
             logger.error(f"Wallet Track Error: {e}")
+
+        elapsed = time.monotonic() - started
+        if elapsed > config.WALLET_POLL_INTERVAL:
+            logger.warning(f"Wallet pass over {len(subscribers)} addresses took {elapsed:.1f}s")
+        await asyncio.sleep(max(1.0, config.WALLET_POLL_INTERVAL - elapsed))
+
+async def track_wallet_batch(bot: Bot, addresses, subscribers, semaphore):
+    async with semaphore:
+        try:
+            activity = await asyncio.wait_for(poly_api.get_wallets_activity(addresses), timeout=config.WALLET_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"Wallet batch of {len(addresses)} addresses timed out")
+            return
+        except UpstreamError as e:
+            logger.warning(f"Wallet batch of {len(addresses)} addresses skipped: {e}")
+            return
+
+    for address in addresses:
+        trades = activity.get(address)
+        if not trades:
+            continue
+        for w in subscribers[address]:
+            try:
+                await track_wallet(bot, w, trades)
+            except Exception as e:
+                logger.error(f"Wallet {w.wallet_address} Track Error: {e}")
+
+async def track_wallet(bot: Bot, w, trades):
+    latest_trade = trades[0]
+    trade_id = latest_trade['id']
+    
+    if w.last_tx_hash == trade_id:
+        return
+
+    first_seen = w.last_tx_hash is None
+    w.last_tx_hash = trade_id
+    await db.update_wallet_tx(w.id, trade_id)
+    
+    if first_seen:
+        return
+
+    fpmm = latest_trade.get('fpmm', {})
+    market_id = fpmm.get('id')
+    market_slug = fpmm.get('slug', '')
+    title = fpmm.get('question', 'Unknown Market')
+    
+    amount_usd = float(latest_trade.get('transactionAmount', 0))
+    outcome_tokens = float(latest_trade.get('outcomeTokensTraded', 0))
+    
+    price_per_share = 0
+    if outcome_tokens > 0:
+        price_per_share = amount_usd / outcome_tokens
+
+    if amount_usd < w.min_vol:
+        return
+
+    if w.price_cond != 'NONE':
+        if w.price_cond == 'ABOVE' and price_per_share < w.price_target:
+            return
+        if w.price_cond == 'BELOW' and price_per_share > w.price_target:
+            return
+
+    is_new_market = market_id not in w.seen_markets
+
+    if w.notify_new_markets and not is_new_market:
+        return
         
-        await asyncio.sleep(60)
+    if is_new_market and market_id:
+        w.seen_markets.add(market_id)
+        await db.add_wallet_seen_market(w.id, market_id)
+
+    outcome_idx = latest_trade.get('outcomeIndex')
+    trade_type = latest_trade.get('type')
+    side = "YES" if outcome_idx == 0 else "NO"
+    
+    if trade_type == "Sell":
+        action_emoji = "🔴"
+        action_text = "SOLD"
+    else:
+        action_emoji = "🟢"
+        action_text = "BOUGHT"
+        
+    header = "🆕 <b>New Market Entry!</b>" if is_new_market else "⚡ <b>New Trade Detected!</b>"
+    
+    kb = InlineKeyboardMarkup(inline_keyboard=[[
+        InlineKeyboardButton(text="🔗 View Market", url=f"https://polymarket.com/market/{market_slug}"),
+        InlineKeyboardButton(text="🔗 View TX", url=f"https://polygonscan.com/tx/{latest_trade['transactionHash']}")
+    ]])
+    
+    msg = (
+        f"🔭 <b>Wallet Tracker: {w.alias}</b>\n\n"
+        f"{header}\n"
+        f"📜 {title}\n"
+        f"{action_emoji} {action_text} <b>{side}</b>\n"
+        f"💲 Price: {price_per_share:.3f}¢\n"
+        f"💰 Amount: ${amount_usd:.2f}"
+    )
+    
+    notifier.send(w.user_id, msg, priority=PRIORITY_ALERT, reply_markup=kb)
 
 async def scanner_arbitrage(bot: Bot):
     sent_arbs = set()
     last_clear = time.time()
+    version = 0
 
     while True:
+        snapshot = await market_snapshots.next(version)
+        version = snapshot.version
         try:
             if time.time() - last_clear > 300:
                 sent_arbs.clear()
                 last_clear = time.time()
 
-            opps = await poly_api.check_arbitrage()
+            opps = await arbitrage.scan(snapshot=snapshot)
             users = await db.get_users_for_arb()
             
             if not users or not opps:
-                await asyncio.sleep(60)
                 continue
 
             for opp in opps:
@@ -192,145 +306,142 @@ async def scanner_arbitrage(bot: Bot):
                     InlineKeyboardButton(text="🔗 Open Market", url=opp['url'])
                 ]])
 
+                if opp['kind'] == 'event':
+                    prices = f"🧩 YES on all {opp['legs']} outcomes: {opp['yes']:.3f}"
+                else:
+                    prices = f"🟩 YES Price: {opp['yes']}\n🟥 NO Price: {opp['no']}"
+
                 text = (
                     f"💎 <b>Arbitrage Opportunity!</b>\n\n"
                     f"❓ {opp['question']}\n"
-                    f"📈 Profit: <b>{opp['profit_str']}</b>\n"
-                    f"🟩 YES Price: {opp['yes']}\n"
-                    f"🟥 NO Price: {opp['no']}"
+                    f"📈 Profit: <b>{opp['profit_str']}</b> (top of book {opp['best_profit']:.2f}%)\n"
+                    f"{prices}\n"
+                    f"💧 Fillable: {opp['size']:.0f} sets for ${opp['cost']:.2f} (+${opp['gain']:.2f})"
                 )
 
-                for uid in users:
-                    try:
-                        await bot.send_message(uid, text, reply_markup=kb)
-                    except:
-                        pass
+                notifier.broadcast(users, text, priority=PRIORITY_ARB, key=f"arb:{opp['id']}", reply_markup=kb)
                 
                 sent_arbs.add(opp['id'])
 
+        except UpstreamError as e:
+            logger.warning(f"Arb Scanner skipped, Polymarket unavailable: {e}")
         except Exception as e:
             logger.error(f"Arb Scanner Error: {e}")
-            
-        await asyncio.sleep(60)
 
 async def scanner_new_markets(bot: Bot):
-    seen_market_ids = set()
-    seen_event_ids = set()
-    first_run = True
+    market_cursor = ListingCursor("new_markets")
+    await market_cursor.load()
+    version = 0
 
     while True:
+        snapshot = await market_snapshots.next(version)
+        version = snapshot.version
         try:
-            logging.info("Scanning for new markets and events...")
-            markets = await poly_api.get_recent_markets()
-            events = await poly_api.get_recent_events()
-            
-            try:
-                with open("last_scan_markets.json", "w", encoding="utf-8") as f:
-                    json.dump(markets, f, indent=4, ensure_ascii=False)
-                with open("last_scan_events.json", "w", encoding="utf-8") as f:
-                    json.dump(events, f, indent=4, ensure_ascii=False)
-            except Exception as e:
-                logger.error(f"Error saving scan files: {e}")
+            logging.info("Scanning for new markets...")
+            announce_markets = not market_cursor.empty
+            markets = market_cursor.fresh(snapshot.by_created)
+            recorder.record("scan_markets", markets)
 
-            users_mkt = await db.get_users_for_markets()
-            users_evt = await db.get_users_for_events()
-            
-            current_m_ids = {str(m['id']) for m in markets}
-            current_e_ids = {str(e['id']) for e in events}
-            
-            if first_run:
-                seen_market_ids.update(current_m_ids)
-                seen_event_ids.update(current_e_ids)
-                first_run = False
-                await asyncio.sleep(10)
-                continue
+            if markets and announce_markets:
+                users_mkt = await db.get_users_for_markets()
+                if users_mkt:
+                    for m in markets:
+                        announce_market(m, users_mkt)
 
-            new_m_ids = current_m_ids - seen_market_ids
-            new_e_ids = current_e_ids - seen_event_ids
-            
-            if users_mkt and new_m_ids:
-                for m in markets:
-                    m_id = str(m['id'])
-                    if m_id in new_m_ids:
-                        desc = m.get('description', '')
-                        if desc and len(desc) > 200:
-                            desc = desc[:200] + "..."
-                        
-                        start_date = m.get('startDate')
-                        if start_date:
-                            start_date = start_date.split('T')[0]
-                        else:
-                            start_date = m.get('createdAt', '').split('T')[0]
-
-                        end_date = m.get('endDate', '').split('T')[0]
-
-                        text = (
-                            f"📣 <b>New Market Listed!</b>\n\n"
-                            f"📜 <b>{m.get('question')}</b>\n\n"
-                        )
-                        
-                        if desc:
-                            text += f"ℹ️ <i>{desc}</i>\n\n"
-                            
-                        text += (
-                            f"📅 Start: {start_date}\n"
-                            f"🏁 End: {end_date}"
-                        )
-                        
-                        kb = InlineKeyboardMarkup(inline_keyboard=[[
-                            InlineKeyboardButton(text="🔗 View Market", url=f"https://polymarket.com/market/{m.get('slug')}")
-                        ]])
-                        
-                        for uid in users_mkt:
-                            try:
-                                await bot.send_message(uid, text, reply_markup=kb)
-                            except:
-                                pass
-            
-            if users_evt and new_e_ids:
-                for e in events:
-                    e_id = str(e['id'])
-                    if e_id in new_e_ids:
-                        start_date = e.get('startDate')
-                        if start_date:
-                            start_date = start_date.split('T')[0]
-                        else:
-                            start_date = e.get('creationDate', '').split('T')[0]
-                            if not start_date: start_date = "TBA"
-
-                        end_date = e.get('endDate', '').split('T')[0]
-                        
-                        desc = e.get('description', '')
-                        if desc and len(desc) > 150:
-                            desc = desc[:150] + "..."
-
-                        text = (
-                            f"🗓 <b>New Event Listed!</b>\n\n"
-                            f"📜 <b>{e.get('title')}</b>\n\n"
-                        )
-                        
-                        if desc:
-                            text += f"ℹ️ {desc}\n\n"
-                            
-                        text += (
-                            f"📅 Start: {start_date}\n"
-                            f"🏁 End: {end_date}"
-                        )
-                        
-                        kb = InlineKeyboardMarkup(inline_keyboard=[[
-                            InlineKeyboardButton(text="🔗 View Event", url=f"https://polymarket.com/event/{e.get('slug')}")
-                        ]])
-                        
-                        for uid in users_evt:
-                            try:
-                                await bot.send_message(uid, text, reply_markup=kb)
-                            except:
-                                pass
-
-            seen_market_ids.update(new_m_ids)
-            seen_event_ids.update(new_e_ids)
+            await market_cursor.advance(markets)
 
         except Exception as e:
-            logger.error(f"New Market/Event Scanner Error: {e}")
+            logger.error(f"New Market Scanner Error: {e}")
+
+async def scanner_new_events(bot: Bot):
+    # event descriptions and dates are not in the market snapshot, so events keep their own
+    # listing and timer and do not stall when the snapshot refresh fails
+    event_cursor = ListingCursor("new_events")
+    await event_cursor.load()
+
+    while True:
+        try:
+            logging.info("Scanning for new events...")
+            announce_events = not event_cursor.empty
+            events = await fetch_new_listings(poly_api.get_recent_events, event_cursor, config.SCANNER_PAGE_SIZE, config.SCANNER_MAX_PAGES)
+            recorder.record("scan_events", events)
+
+            if events and announce_events:
+                users_evt = await db.get_users_for_events()
+                if users_evt:
+                    for e in events:
+                        announce_event(e, users_evt)
+
+            await event_cursor.advance(events)
+
+        except UpstreamError as e:
+            logger.warning(f"New Event Scanner skipped, Polymarket unavailable: {e}")
+        except Exception as e:
+            logger.error(f"New Event Scanner Error: {e}")
+
+        await asyncio.sleep(60)
+
+def announce_market(m, users):
+    desc = m.description
+    if desc and len(desc) > 200:
+        desc = desc[:200] + "..."
+    
+    start_date = m.start_date
+    if start_date:
+        start_date = start_date.split('T')[0]
+    else:
+        start_date = m.created_at.split('T')[0]
+
+    end_date = m.end_date.split('T')[0]
+
+    text = (
+        f"📣 <b>New Market Listed!</b>\n\n"
+        f"📜 <b>{m.question}</b>\n\n"
+    )
+    
+    if desc:
+        text += f"ℹ️ <i>{desc}</i>\n\n"
+        
+    text += (
+        f"📅 Start: {start_date}\n"
+        f"🏁 End: {end_date}"
+    )
+    
+    kb = InlineKeyboardMarkup(inline_keyboard=[[
+        InlineKeyboardButton(text="🔗 View Market", url=f"https://polymarket.com/market/{m.slug}")
+    ]])
+    
+    notifier.broadcast(users, text, priority=PRIORITY_LISTING, reply_markup=kb)
+
+def announce_event(e, users):
+    start_date = e.start_date
+    if start_date:
+        start_date = start_date.split('T')[0]
+    else:
+        start_date = e.creation_date.split('T')[0]
+        if not start_date: start_date = "TBA"
+
+    end_date = e.end_date.split('T')[0]
+    
+    desc = e.description
+    if desc and len(desc) > 150:
+        desc = desc[:150] + "..."
+
+    text = (
+        f"🗓 <b>New Event Listed!</b>\n\n"
+        f"📜 <b>{e.title}</b>\n\n"
+    )
+    
+    if desc:
+        text += f"ℹ️ {desc}\n\n"
         
-        await asyncio.sleep(60)
\ No newline at end of file
+    text += (
+        f"📅 Start: {start_date}\n"
+        f"🏁 End: {end_date}"
+    )
+    
+    kb = InlineKeyboardMarkup(inline_keyboard=[[
+        InlineKeyboardButton(text="🔗 View Event", url=f"https://polymarket.com/event/{e.slug}")
+    ]])
+    
+    notifier.broadcast(users, text, priority=PRIORITY_LISTING, reply_markup=kb)
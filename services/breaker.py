@@ -0,0 +1,60 @@
+import time
+
+class UpstreamError(Exception):
+    def __init__(self, upstream, reason, retry_after=None):
+        super().__init__(f"{upstream}: {reason}")
+        self.upstream = upstream
+        self.reason = reason
+        self.retry_after = retry_after
+
+class CircuitOpenError(UpstreamError):
+    pass
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, name, threshold, reset_timeout):
+        self.name = name
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.trips = 0
+        self.rejected = 0
+
+    def check(self):
+        # True when the caller holds the half-open probe and has to settle it
+        if self.state == self.CLOSED:
+            return False
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self.probing = False
+        if self.state == self.HALF_OPEN and not self.probing:
+            # let a single request through to find out whether the upstream is back
+            self.probing = True
+            return True
+        self.rejected += 1
+        raise CircuitOpenError(self.name, "circuit open")
+
+    def release(self):
+        # the probe ended without a verdict (rate limited, cancelled), let the next caller probe
+        if self.state == self.HALF_OPEN:
+            self.probing = False
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self.probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+            if self.state != self.OPEN:
+                self.trips += 1
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self.probing = False
@@ -0,0 +1,72 @@
+import time
+from collections import OrderedDict
+
+class CacheEntry:
+    __slots__ = ("data", "etag", "size", "fresh_until", "stale_until")
+
+    def __init__(self, data, etag, size, ttl, stale_ttl):
+        self.data = data
+        self.etag = etag
+        self.size = size
+        self.touch(ttl, stale_ttl)
+
+    def touch(self, ttl, stale_ttl):
+        now = time.monotonic()
+        self.fresh_until = now + ttl
+        self.stale_until = now + ttl + stale_ttl
+
+    @property
+    def fresh(self):
+        return time.monotonic() < self.fresh_until
+
+    @property
+    def usable(self):
+        return time.monotonic() < self.stale_until
+
+class ResponseCache:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.evicted = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if not entry.usable and not entry.etag:
+            self.discard(key)
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, data, etag, size, ttl, stale_ttl):
+        self.discard(key)
+        if size > self.max_bytes:
+            return
+        self.entries[key] = CacheEntry(data, etag, size, ttl, stale_ttl)
+        self.size += size
+        while self.size > self.max_bytes:
+            _, old = self.entries.popitem(last=False)
+            self.size -= old.size
+            self.evicted += 1
+
+    def discard(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "bytes": self.size,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "evicted": self.evicted,
+        }
@@ -0,0 +1,82 @@
+from datetime import datetime, timezone
+from database.database import db
+
+EPOCH = datetime.min.replace(tzinfo=timezone.utc)
+
+def parse_created_at(value):
+    if not value:
+        return EPOCH
+    try:
+        created = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return EPOCH
+    if created.tzinfo is None:
+        created = created.replace(tzinfo=timezone.utc)
+    return created
+
+class ListingCursor:
+    def __init__(self, name):
+        self.name = name
+        self.created_at = None
+        self.ids = set()
+
+    @property
+    def empty(self):
+        return self.created_at is None
+
+    async def load(self):
+        state = await db.get_scanner_state(self.name)
+        if state:
+            self.created_at = parse_created_at(state['created_at'])
+            self.ids = set(state['ids'])
+
+    async def save(self):
+        await db.set_scanner_state(self.name, {
+            'created_at': self.created_at.isoformat(),
+            'ids': sorted(self.ids),
+        })
+
+    def is_new(self, item):
+        if self.created_at is None:
+            return True
+        created = parse_created_at(item.created_at)
+        if created > self.created_at:
+            return True
+        return created == self.created_at and item.id not in self.ids
+
+    def fresh(self, items):
+        # items run newest-first, so everything after the cursor's timestamp is already known
+        new_items = []
+        for item in items:
+            if self.created_at is not None and parse_created_at(item.created_at) < self.created_at:
+                break
+            if self.is_new(item):
+                new_items.append(item)
+        return new_items
+
+    async def advance(self, items):
+        if not items:
+            return
+        newest = max(parse_created_at(item.created_at) for item in items)
+        if self.created_at is None or newest > self.created_at:
+            self.created_at = newest
+            self.ids = set()
+        self.ids.update(
+            item.id for item in items
+            if parse_created_at(item.created_at) == self.created_at
+        )
+        await self.save()
+
+async def fetch_new_listings(fetch_page, cursor, page_size, max_pages):
+    # pages run newest-first, so stop once a page reaches already announced items
+    if cursor.empty:
+        return await fetch_page(limit=page_size, offset=0)
+
+    new_items = []
+    for page in range(max_pages):
+        items = await fetch_page(limit=page_size, offset=page * page_size)
+        fresh = [item for item in items if cursor.is_new(item)]
+        new_items.extend(fresh)
+        if len(fresh) < len(items) or len(items) < page_size:
+            break
+    return new_items
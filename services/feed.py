@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import random
+import time
+import aiohttp
+from config.config import config
+from services.models import loads
+
+logger = logging.getLogger(__name__)
+
+# Polymarket shows the midpoint unless the spread is wider than this, then the last trade
+DISPLAY_SPREAD = 0.10
+
+class Quote:
+    __slots__ = ("bid", "ask", "last", "updated")
+
+    def __init__(self):
+        self.bid = None
+        self.ask = None
+        self.last = None
+        self.updated = 0.0
+
+    @property
+    def price(self):
+        if self.bid is not None and self.ask is not None:
+            if self.ask - self.bid <= DISPLAY_SPREAD or self.last is None:
+                return (self.bid + self.ask) / 2
+        return self.last
+
+class PriceFeed:
+    def __init__(self, url):
+        self.url = url
+        self.quotes = {}
+        self.assets = {}
+        self.listeners = []
+        self.session = None
+        self.ws = None
+        self.task = None
+        self.changed = asyncio.Event()
+        self.connected = False
+        self.reconnects = 0
+        self.messages = 0
+
+    def start(self):
+        if self.task or not config.FEED_ENABLED:
+            return
+        self.session = aiohttp.ClientSession()
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    def on_price(self, callback):
+        self.listeners.append(callback)
+
+    def watch(self, assets):
+        # assets maps token id -> (market id, outcome) for everything alerts are waiting on
+        added = assets.keys() - self.assets.keys()
+        removed = self.assets.keys() - assets.keys()
+        self.assets = dict(assets)
+        for token in removed:
+            self.quotes.pop(token, None)
+        if self.ws is not None and not self.ws.closed:
+            if added:
+                asyncio.create_task(self._send({"assets_ids": sorted(added), "operation": "subscribe"}))
+            if removed:
+                asyncio.create_task(self._send({"assets_ids": sorted(removed), "operation": "unsubscribe"}))
+        self.changed.set()
+
+    def price(self, token_id, max_age=None):
+        quote = self.quotes.get(token_id)
+        if quote is None or not self.connected:
+            return None
+        if max_age is not None and time.monotonic() - quote.updated > max_age:
+            return None
+        return quote.price
+
+    def outcome_price(self, market, outcome):
+        index = 1 if outcome == 'NO' else 0
+        if len(market.token_ids) > index:
+            price = self.price(market.token_ids[index], config.FEED_STALE_AFTER)
+            if price is not None:
+                return price
+        return market.outcome_price(outcome)
+
+    async def _send(self, payload):
+        try:
+            await self.ws.send_json(payload)
+        except Exception as e:
+            logger.warning(f"Price feed subscription update failed: {e}")
+
+    async def _run(self):
+        attempt = 0
+        while True:
+            while not self.assets:
+                self.changed.clear()
+                await self.changed.wait()
+            try:
+                async with self.session.ws_connect(self.url, timeout=aiohttp.ClientWSTimeout(ws_close=10)) as ws:
+                    self.ws = ws
+                    await ws.send_json({"assets_ids": sorted(self.assets), "type": "market"})
+                    self.connected = True
+                    attempt = 0
+                    logger.info(f"Price feed connected, {len(self.assets)} assets")
+                    pinger = asyncio.create_task(self._ping(ws))
+                    try:
+                        async for msg in ws:
+                            if msg.type == aiohttp.WSMsgType.TEXT:
+                                self._handle(msg.data)
+                            elif msg.type in (aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSED):
+                                break
+                    finally:
+                        pinger.cancel()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"Price feed connection failed: {e}")
+            except Exception as e:
+                logger.error(f"Price feed error: {e}")
+            finally:
+                self.ws = None
+                self.connected = False
+
+            attempt += 1
+            self.reconnects += 1
+            delay = random.uniform(0, min(config.FEED_BACKOFF_MAX, 2 ** attempt))
+            logger.info(f"Price feed disconnected, reconnecting in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def _ping(self, ws):
+        while not ws.closed:
+            await asyncio.sleep(config.FEED_PING_INTERVAL)
+            await ws.send_str("PING")
+
+    def _handle(self, data):
+        if data == "PONG":
+            return
+        try:
+            events = loads(data)
+        except ValueError:
+            return
+        if isinstance(events, dict):
+            events = [events]
+        for event in events:
+            if isinstance(event, dict):
+                self.messages += 1
+                try:
+                    self._apply(event)
+                except (ValueError, KeyError, TypeError) as e:
+                    logger.warning(f"Skipping malformed price feed message: {e}")
+
+    def _apply(self, event):
+        kind = event.get('event_type')
+        if kind == "book":
+            bids = [float(level['price']) for level in event.get('bids') or ()]
+            asks = [float(level['price']) for level in event.get('asks') or ()]
+            self._update(event.get('asset_id'), bid=max(bids, default=None), ask=min(asks, default=None))
+        elif kind == "price_change":
+            for change in event.get('price_changes') or ():
+                self._update(change.get('asset_id'), bid=change.get('best_bid'), ask=change.get('best_ask'))
+        elif kind == "best_bid_ask":
+            self._update(event.get('asset_id'), bid=event.get('best_bid'), ask=event.get('best_ask'))
+        elif kind == "last_trade_price":
+            self._update(event.get('asset_id'), last=event.get('price'))
+
+    def _update(self, token, bid=None, ask=None, last=None):
+        target = self.assets.get(token)
+        if target is None:
+            return
+        quote = self.quotes.get(token)
+        if quote is None:
+            quote = self.quotes[token] = Quote()
+        if bid is not None:
+            quote.bid = float(bid)
+        if ask is not None:
+            quote.ask = float(ask)
+        if last is not None:
+            quote.last = float(last)
+        quote.updated = time.monotonic()
+
+        price = quote.price
+        if price is None:
+            return
+        market_id, outcome = target
+        for callback in self.listeners:
+            try:
+                callback(market_id, outcome, price)
+            except Exception as e:
+                logger.error(f"Price feed listener error: {e}")
+
+feed = PriceFeed(config.FEED_URL)
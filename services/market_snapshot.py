@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import time
+from types import MappingProxyType
+from config.config import config
+from services.api import poly_api, UpstreamError
+from services.cursor import parse_created_at
+
+logger = logging.getLogger(__name__)
+
+class MarketSnapshot:
+    __slots__ = ("version", "built_at", "pages", "markets", "by_id", "by_slug", "by_event", "by_created")
+
+    def __init__(self, version, pages):
+        self.version = version
+        self.built_at = time.monotonic()
+        self.pages = tuple(pages)
+        by_id = {}
+        for page in self.pages:
+            for m in page:
+                by_id[m.id] = m
+        self.markets = tuple(by_id.values())
+        self.by_id = MappingProxyType(by_id)
+        self.by_slug = MappingProxyType({m.slug: m for m in self.markets if m.slug})
+        by_event = {}
+        for m in self.markets:
+            if m.event_id:
+                by_event.setdefault(m.event_id, []).append(m)
+        self.by_event = MappingProxyType({e: tuple(ms) for e, ms in by_event.items()})
+        # newest first, the order the listing scanner walks in
+        self.by_created = tuple(sorted(self.markets, key=lambda m: parse_created_at(m.created_at), reverse=True))
+
+    @property
+    def age(self):
+        return time.monotonic() - self.built_at
+
+class MarketSnapshotService:
+    def __init__(self):
+        self.current = None
+        self.version = 0
+        self.updated = None
+        self.refreshing = None
+        self.task = None
+        self.refresh_ms = 0.0
+        self.truncated = 0
+
+    def start(self):
+        if self.task:
+            return
+        self.updated = asyncio.Condition()
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    async def latest(self):
+        if self.current is None:
+            await self.refresh()
+        return self.current
+
+    async def next(self, after_version):
+        # wait until something newer than after_version has been published
+        if self.current is None or self.current.version <= after_version:
+            async with self.updated:
+                await self.updated.wait_for(lambda: self.current is not None and self.current.version > after_version)
+        return self.current
+
+    async def refresh(self):
+        if self.refreshing is None:
+            self.refreshing = asyncio.create_task(self._refresh())
+            self.refreshing.add_done_callback(lambda _: setattr(self, "refreshing", None))
+        return await asyncio.shield(self.refreshing)
+
+    async def _refresh(self):
+        started = time.perf_counter()
+        pages = await self._load_pages()
+        self.version += 1
+        snapshot = await asyncio.to_thread(MarketSnapshot, self.version, pages)
+        self.current = snapshot
+        self.refresh_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"Market snapshot v{snapshot.version}: {len(snapshot.markets)} markets in {self.refresh_ms:.0f}ms")
+        if self.updated is not None:
+            async with self.updated:
+                self.updated.notify_all()
+        return snapshot
+
+    async def _load_pages(self):
+        size = config.SNAPSHOT_PAGE_SIZE
+        pages = []
+        while len(pages) < config.SNAPSHOT_MAX_PAGES:
+            window = range(len(pages), min(len(pages) + config.SNAPSHOT_PAGE_CONCURRENCY, config.SNAPSHOT_MAX_PAGES))
+            fetched = await asyncio.gather(*(
+                poly_api.get_active_markets(size, p * size) for p in window
+            ))
+            pages.extend(fetched)
+            if any(len(items) < size for items in fetched):
+                return pages
+        # pages run oldest id first, so whatever the cap cuts off are the newest markets
+        self.truncated += 1
+        logger.warning(
+            f"Market snapshot stopped at SNAPSHOT_MAX_PAGES ({len(pages)} pages of {size}), "
+            f"newer markets are missing from it"
+        )
+        return pages
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except UpstreamError as e:
+                logger.warning(f"Market snapshot refresh skipped, Polymarket unavailable: {e}")
+            except Exception as e:
+                logger.error(f"Market snapshot refresh error: {e}")
+            await asyncio.sleep(config.SNAPSHOT_INTERVAL)
+
+market_snapshots = MarketSnapshotService()
@@ -0,0 +1,106 @@
+import json
+
+try:
+    import orjson
+    loads = orjson.loads
+except ImportError:
+    loads = json.loads
+
+def parse_prices(value):
+    # Gamma sends outcomePrices as a JSON string inside the JSON document
+    if isinstance(value, str):
+        try:
+            value = loads(value)
+        except ValueError:
+            return ()
+    try:
+        return tuple(float(p) for p in value or ())
+    except (TypeError, ValueError):
+        return ()
+
+def parse_tokens(value):
+    if isinstance(value, str):
+        try:
+            value = loads(value)
+        except ValueError:
+            return ()
+    return tuple(str(t) for t in value or ())
+
+class Market:
+    __slots__ = (
+        "id", "question", "slug", "description",
+        "start_date", "end_date", "created_at", "outcome_prices",
+        "neg_risk", "event_id", "event_slug", "event_title", "token_ids",
+    )
+
+    def __init__(self, data):
+        self.id = str(data.get('id'))
+        self.question = data.get('question')
+        self.slug = data.get('slug')
+        self.description = data.get('description') or ''
+        self.start_date = data.get('startDate')
+        self.end_date = data.get('endDate') or ''
+        self.created_at = data.get('createdAt') or ''
+        self.outcome_prices = parse_prices(data.get('outcomePrices'))
+        self.token_ids = parse_tokens(data.get('clobTokenIds'))
+        self.neg_risk = bool(data.get('negRisk'))
+        events = data.get('events') or ({},)
+        event_id = events[0].get('id')
+        self.event_id = str(event_id) if event_id is not None else ''
+        self.event_slug = events[0].get('slug')
+        self.event_title = events[0].get('title')
+
+    def outcome_price(self, outcome):
+        if not self.outcome_prices:
+            return None
+        yes_price = self.outcome_prices[0]
+        if outcome == 'NO':
+            if len(self.outcome_prices) > 1:
+                return self.outcome_prices[1]
+            return 1.0 - yes_price
+        return yes_price
+
+class Event:
+    __slots__ = (
+        "id", "title", "slug", "description",
+        "start_date", "end_date", "created_at", "creation_date", "markets",
+    )
+
+    def __init__(self, data):
+        self.id = str(data.get('id'))
+        self.title = data.get('title')
+        self.slug = data.get('slug')
+        self.description = data.get('description') or ''
+        self.start_date = data.get('startDate')
+        self.end_date = data.get('endDate') or ''
+        self.created_at = data.get('createdAt') or ''
+        self.creation_date = data.get('creationDate') or ''
+        self.markets = [Market(m) for m in data.get('markets') or ()]
+
+class OrderBook:
+    __slots__ = ("token_id", "asks")
+
+    def __init__(self, data):
+        self.token_id = data.get('asset_id')
+        # cheapest first, whatever order the CLOB sent them in
+        self.asks = sorted(
+            (float(level['price']), float(level['size']))
+            for level in data.get('asks') or ()
+        )
+
+def parse_market(data):
+    return Market(data) if isinstance(data, dict) else None
+
+def parse_markets(data):
+    return [Market(m) for m in data] if isinstance(data, list) else []
+
+def parse_book(data):
+    return OrderBook(data) if isinstance(data, dict) else None
+
+def parse_events(data):
+    if isinstance(data, dict):
+        data = [data]
+    return [Event(e) for e in data] if isinstance(data, list) else []
+
+def as_dict(record):
+    return {name: getattr(record, name) for name in record.__slots__}
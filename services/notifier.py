@@ -0,0 +1,319 @@
+import asyncio
+import itertools
+import logging
+import random
+import time
+from collections import deque
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramNetworkError,
+    TelegramRetryAfter,
+    TelegramServerError,
+)
+from config.config import config
+from services.ratelimit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_ALERT = 0
+PRIORITY_ARB = 1
+PRIORITY_LISTING = 2
+PRIORITY_NAMES = ("alerts", "arbitrage", "listings")
+TELEGRAM_TEXT_LIMIT = 4096
+
+def text_length(text):
+    # Telegram counts message length in UTF-16 code units
+    return len(text.encode('utf-16-le')) // 2
+
+class Notification:
+    __slots__ = ("chat_id", "text", "kwargs", "priority", "key", "attempts", "created")
+
+    def __init__(self, chat_id, text, kwargs, priority, key):
+        self.chat_id = chat_id
+        self.text = text
+        self.kwargs = kwargs
+        self.priority = priority
+        self.key = key
+        self.attempts = 0
+        self.created = time.monotonic()
+
+class Digest:
+    __slots__ = ("items", "priority")
+
+    def __init__(self):
+        self.items = []
+        self.priority = PRIORITY_LISTING
+
+class ChatQueue:
+    __slots__ = ("lanes", "token", "ready_priority")
+
+    def __init__(self):
+        self.lanes = tuple(deque() for _ in PRIORITY_NAMES)
+        self.token = None
+        self.ready_priority = None
+
+    def head(self):
+        for lane in self.lanes:
+            if lane:
+                return lane[0]
+        return None
+
+    def __len__(self):
+        return sum(len(lane) for lane in self.lanes)
+
+class Notifier:
+    def __init__(self):
+        self.bot = None
+        self.pending = {}
+        self.chat_next = {}
+        self.ready = None
+        self.workers = []
+        self.bucket = TokenBucket(config.TG_GLOBAL_RATE)
+        self.tokens = itertools.count()
+        # alerts never expire; an arbitrage or listing message this old is no longer worth sending
+        self.max_ages = (None, config.TG_ARB_MAX_AGE, config.TG_LISTING_MAX_AGE)
+        self.depth = [0] * len(PRIORITY_NAMES)
+        self.shed = [0] * len(PRIORITY_NAMES)
+        self.coalesced = [0] * len(PRIORITY_NAMES)
+        self.digest_chats = set()
+        self.digests = {}
+        self.digested = 0
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+
+    def start(self, bot: Bot):
+        if self.workers:
+            return
+        self.bot = bot
+        self.ready = asyncio.PriorityQueue()
+        self.workers = [asyncio.create_task(self._worker()) for _ in range(config.TG_WORKERS)]
+
+    async def stop(self, timeout=5.0):
+        for chat_id in list(self.digests):
+            self._flush_digest(chat_id)
+        deadline = time.monotonic() + timeout
+        while self.pending and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        for task in self.workers:
+            task.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        if self.pending:
+            logger.warning(f"Notifier stopped with {sum(self.depth)} undelivered messages")
+
+    def set_digest(self, chat_id, enabled):
+        if enabled:
+            self.digest_chats.add(chat_id)
+        else:
+            self.digest_chats.discard(chat_id)
+
+    def send(self, chat_id, text, priority=PRIORITY_ALERT, key=None, **kwargs):
+        if chat_id in self.digest_chats:
+            self._add_to_digest(chat_id, text, priority, key, kwargs)
+        else:
+            self._enqueue(chat_id, text, priority, key, kwargs)
+
+    def _add_to_digest(self, chat_id, text, priority, key, kwargs):
+        digest = self.digests.get(chat_id)
+        if digest is None:
+            digest = self.digests[chat_id] = Digest()
+            asyncio.get_running_loop().call_later(config.TG_DIGEST_WINDOW, self._flush_digest, chat_id)
+
+        if key is not None:
+            for item in digest.items:
+                if item.key == key:
+                    item.text = text
+                    item.kwargs = kwargs
+                    return
+        digest.items.append(Notification(chat_id, text, kwargs, priority, key))
+        digest.priority = min(digest.priority, priority)
+
+    def _flush_digest(self, chat_id):
+        digest = self.digests.pop(chat_id, None)
+        if not digest or not digest.items:
+            return
+
+        if len(digest.items) == 1:
+            item = digest.items[0]
+            self._enqueue(chat_id, item.text, item.priority, item.key, item.kwargs)
+            return
+
+        self.digested += len(digest.items)
+        header = f"📦 <b>Digest</b> ({len(digest.items)} updates)\n\n"
+        separator = "\n\n➖➖➖➖➖\n\n"
+        parts = []
+        size = text_length(header)
+        for item in sorted(digest.items, key=lambda item: item.priority):
+            links = self._markup_links(item.kwargs.get('reply_markup'))
+            body = f"{item.text}\n{links}" if links else item.text
+            body_size = text_length(separator) + text_length(body)
+            if parts and size + body_size > TELEGRAM_TEXT_LIMIT:
+                self._enqueue(chat_id, header + separator.join(parts), digest.priority, None, {'disable_web_page_preview': True})
+                parts = []
+                size = text_length(header)
+            parts.append(body)
+            size += body_size
+        self._enqueue(chat_id, header + separator.join(parts), digest.priority, None, {'disable_web_page_preview': True})
+
+    def _markup_links(self, markup):
+        if not markup:
+            return ""
+        links = [
+            f"<a href='{button.url}'>{button.text}</a>"
+            for row in markup.inline_keyboard
+            for button in row
+            if button.url
+        ]
+        return " | ".join(links)
+
+    def _enqueue(self, chat_id, text, priority, key, kwargs):
+        chat = self.pending.get(chat_id)
+        lane = chat.lanes[priority] if chat else None
+
+        if key is not None and lane:
+            for queued in lane:
+                if queued.key == key and queued.attempts == 0:
+                    queued.text = text
+                    queued.kwargs = kwargs
+                    self.coalesced[priority] += 1
+                    return
+
+        if chat is None:
+            chat = self.pending[chat_id] = ChatQueue()
+            chat.lanes[priority].append(Notification(chat_id, text, kwargs, priority, key))
+            self.depth[priority] += 1
+            self._schedule(chat_id, self.chat_next.pop(chat_id, 0.0) - time.monotonic())
+            return
+
+        chat.lanes[priority].append(Notification(chat_id, text, kwargs, priority, key))
+        self.depth[priority] += 1
+        # already waiting in the ready queue behind a lower class: jump ahead
+        if chat.token is not None and priority < chat.ready_priority:
+            self._push_ready(chat_id, chat)
+
+    def broadcast(self, chat_ids, text, priority=PRIORITY_ALERT, key=None, **kwargs):
+        # random order, so the messages that expire under load are not always the same users'
+        chat_ids = list(chat_ids)
+        random.shuffle(chat_ids)
+        for chat_id in chat_ids:
+            self.send(chat_id, text, priority=priority, key=key, **kwargs)
+
+    def stats(self):
+        now = time.monotonic()
+        oldest = [None] * len(PRIORITY_NAMES)
+        for chat in self.pending.values():
+            for priority, lane in enumerate(chat.lanes):
+                if lane:
+                    age = now - lane[0].created
+                    if oldest[priority] is None or age > oldest[priority]:
+                        oldest[priority] = age
+
+        return {
+            name: {
+                "depth": self.depth[p],
+                "oldest_age": oldest[p] or 0.0,
+                "shed": self.shed[p],
+                "coalesced": self.coalesced[p],
+            }
+            for p, name in enumerate(PRIORITY_NAMES)
+        } | {
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+            "digested": self.digested,
+            "digest_pending": sum(len(d.items) for d in self.digests.values()),
+        }
+
+    def _push_ready(self, chat_id, chat):
+        head = chat.head()
+        if head is None:
+            return
+        chat.token = next(self.tokens)
+        chat.ready_priority = head.priority
+        self.ready.put_nowait((head.priority, chat.token, chat_id))
+
+    def _wake(self, chat_id):
+        chat = self.pending.get(chat_id)
+        if chat is not None:
+            self._push_ready(chat_id, chat)
+
+    def _schedule(self, chat_id, delay):
+        if delay <= 0:
+            self._wake(chat_id)
+        else:
+            asyncio.get_running_loop().call_later(delay, self._wake, chat_id)
+
+    def _expire_chat(self, chat_id, deadline):
+        # a chat messaged again since then owns a newer slot with its own timer
+        if self.chat_next.get(chat_id) == deadline:
+            del self.chat_next[chat_id]
+
+    async def _worker(self):
+        while True:
+            chat_id, chat, note = await self._next_note()
+            # the slot is taken only now, so a flood-control pause that started while this
+            # worker sat idle still holds it back
+            await self.bucket.acquire()
+            # a higher class may have reached this chat while waiting for the slot
+            note = chat.head()
+            retry_in = await self._deliver(note)
+            if retry_in is None:
+                chat.lanes[note.priority].popleft()
+                self.depth[note.priority] -= 1
+
+            if len(chat):
+                self._schedule(chat_id, max(retry_in or 0.0, config.TG_PER_CHAT_INTERVAL))
+            else:
+                del self.pending[chat_id]
+                deadline = self.chat_next[chat_id] = time.monotonic() + config.TG_PER_CHAT_INTERVAL
+                asyncio.get_running_loop().call_later(config.TG_PER_CHAT_INTERVAL, self._expire_chat, chat_id, deadline)
+
+    async def _next_note(self):
+        while True:
+            _, token, chat_id = await self.ready.get()
+            chat = self.pending.get(chat_id)
+            if chat is None or chat.token != token:
+                continue
+            chat.token = None
+
+            note = chat.head()
+            while note is not None and self._expired(note):
+                chat.lanes[note.priority].popleft()
+                self.depth[note.priority] -= 1
+                self.shed[note.priority] += 1
+                note = chat.head()
+            if note is not None:
+                return chat_id, chat, note
+            del self.pending[chat_id]
+
+    def _expired(self, note):
+        max_age = self.max_ages[note.priority]
+        return max_age is not None and time.monotonic() - note.created > max_age
+
+    async def _deliver(self, note):
+        try:
+            await self.bot.send_message(note.chat_id, note.text, **note.kwargs)
+            self.sent += 1
+            return None
+        except TelegramRetryAfter as e:
+            logger.warning(f"Telegram flood control, retrying in {e.retry_after}s")
+            self.bucket.pause(e.retry_after)
+            self.retried += 1
+            return float(e.retry_after)
+        except (TelegramForbiddenError, TelegramBadRequest) as e:
+            logger.info(f"Dropping message to {note.chat_id}: {e}")
+        except (TelegramNetworkError, TelegramServerError, asyncio.TimeoutError) as e:
+            note.attempts += 1
+            if note.attempts < config.TG_MAX_ATTEMPTS:
+                self.retried += 1
+                return min(2.0 ** note.attempts, 60.0)
+            logger.error(f"Giving up on message to {note.chat_id} after {note.attempts} attempts: {e}")
+        except Exception as e:
+            logger.error(f"Failed to send message to {note.chat_id}: {e}")
+        self.failed += 1
+        return None
+
+notifier = Notifier()
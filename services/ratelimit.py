@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, tokens=1):
+        waited = 0.0
+        while True:
+            now = time.monotonic()
+            if now < self.paused_until:
+                delay = self.paused_until - now
+            else:
+                self._refill(now)
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                delay = (tokens - self.tokens) / self.rate
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds):
+        now = time.monotonic()
+        self.paused_until = max(self.paused_until, now + seconds)
+        self.tokens = 0.0
+        self.updated = self.paused_until
+
+class HostLimiter:
+    def __init__(self, rate, interactive_rate):
+        # separate buckets so background polling can never eat the budget of user-facing requests
+        self.buckets = {False: TokenBucket(rate), True: TokenBucket(interactive_rate)}
+        self.requests = 0
+        self.throttled = 0
+        self.waited = 0.0
+        self.limited = 0
+
+    async def acquire(self, interactive=False):
+        waited = await self.buckets[interactive].acquire()
+        self.requests += 1
+        if waited:
+            self.throttled += 1
+            self.waited += waited
+
+    def paused_for(self, interactive=False):
+        return max(0.0, self.buckets[interactive].paused_until - time.monotonic())
+
+    def backoff(self, seconds):
+        self.limited += 1
+        for bucket in self.buckets.values():
+            bucket.pause(seconds)
@@ -0,0 +1,50 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+import time
+from config.config import config
+from services.models import as_dict
+
+logger = logging.getLogger(__name__)
+
+class ScanRecorder:
+    def __init__(self, directory, keep, enabled):
+        self.directory = directory
+        self.keep = keep
+        self.enabled = enabled
+        self.writing = {}
+
+    def record(self, name, payload):
+        if not self.enabled:
+            return
+        task = self.writing.get(name)
+        if task and not task.done():
+            logger.warning(f"Skipping {name} snapshot, previous write still running")
+            return
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        self.writing[name] = asyncio.create_task(asyncio.to_thread(self._write, name, stamp, payload))
+
+    def _write(self, name, stamp, payload):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"{name}-{stamp}.json.gz")
+            tmp_path = path + ".tmp"
+            with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=5) as f:
+                json.dump(payload, f, separators=(",", ":"), ensure_ascii=False, default=as_dict)
+            os.replace(tmp_path, path)
+            self._rotate(name)
+        except Exception as e:
+            logger.error(f"Error saving {name} snapshot: {e}")
+
+    def _rotate(self, name):
+        prefix = f"{name}-"
+        snapshots = sorted(
+            f for f in os.listdir(self.directory)
+            if f.startswith(prefix) and f.endswith(".json.gz")
+        )
+        for old in snapshots[:-self.keep]:
+            os.remove(os.path.join(self.directory, old))
+
+recorder = ScanRecorder(config.SCAN_SNAPSHOT_DIR, config.SCAN_SNAPSHOT_KEEP, config.SCAN_SNAPSHOTS)
@@ -0,0 +1,99 @@
+import logging
+import sys
+from database.database import db
+from services.alerts import AlertIndex
+
+logger = logging.getLogger(__name__)
+
+class AlertRecord:
+    __slots__ = ("id", "user_id", "market_id", "market_slug", "alert_price", "condition", "outcome")
+
+    def __init__(self, row):
+        self.id = row['id']
+        self.user_id = row['user_id']
+        self.market_id = str(row['market_id'])
+        self.market_slug = row['market_slug']
+        self.alert_price = row['alert_price']
+        self.condition = sys.intern(row['condition'])
+        self.outcome = sys.intern(row['outcome'])
+
+class WalletRecord:
+    __slots__ = (
+        "id", "user_id", "wallet_address", "alias", "last_tx_hash",
+        "min_vol", "price_target", "price_cond", "notify_new_markets", "seen_markets"
+    )
+
+    def __init__(self, row, seen_markets=None):
+        self.id = row['id']
+        self.user_id = row['user_id']
+        self.wallet_address = row['wallet_address']
+        self.alias = row['alias']
+        self.last_tx_hash = row['last_tx_hash']
+        self.min_vol = row['min_vol']
+        self.price_target = row['price_target']
+        self.price_cond = sys.intern(row['price_cond'])
+        self.notify_new_markets = row['notify_new_markets']
+        self.seen_markets = seen_markets if seen_markets is not None else set()
+
+class Registry:
+    def __init__(self):
+        self.alerts = {}
+        self.index = AlertIndex()
+        self.wallets = {}
+
+    async def load(self):
+        self.alerts.clear()
+        self.index = AlertIndex()
+        self.wallets.clear()
+
+        for row in await db.get_all_watchlists():
+            self.add_alert(row)
+        seen = await db.get_all_seen_markets()
+        for row in await db.get_tracked_wallets():
+            self.add_wallet(row, seen.get(row['id']))
+
+        logger.info(f"Registry loaded: {len(self.alerts)} alerts, {len(self.wallets)} wallets")
+
+    def add_alert(self, row):
+        if not row:
+            return
+        self.remove_alert(row['id'])
+        alert = AlertRecord(row)
+        self.alerts[alert.id] = alert
+        self.index.add(alert.id, alert.market_id, alert.outcome, alert.alert_price, alert.condition)
+
+    def update_alert(self, alert_id, price, condition, outcome):
+        alert = self.alerts.get(alert_id)
+        if not alert:
+            return
+        self.index.remove(alert.id, alert.market_id, alert.outcome, alert.alert_price, alert.condition)
+        alert.alert_price = price
+        alert.condition = sys.intern(condition)
+        alert.outcome = sys.intern(outcome)
+        self.index.add(alert.id, alert.market_id, alert.outcome, alert.alert_price, alert.condition)
+
+    def remove_alert(self, alert_id):
+        alert = self.alerts.pop(alert_id, None)
+        if alert:
+            self.index.remove(alert.id, alert.market_id, alert.outcome, alert.alert_price, alert.condition)
+        return alert
+
+    def add_wallet(self, row, seen_markets=None):
+        if not row:
+            return
+        wallet = WalletRecord(row, seen_markets)
+        self.wallets[wallet.id] = wallet
+
+    def update_wallet_settings(self, wallet_id, min_vol, price_target, price_cond, notify_new):
+        wallet = self.wallets.get(wallet_id)
+        if not wallet:
+            return
+        wallet.min_vol = min_vol
+        wallet.price_target = price_target
+        wallet.price_cond = sys.intern(price_cond)
+        wallet.notify_new_markets = notify_new
+
+    def remove_wallet(self, wallet_id):
+        return self.wallets.pop(wallet_id, None)
+
+registry = Registry()
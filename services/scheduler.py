@@ -0,0 +1,125 @@
+import heapq
+import math
+import time
+from datetime import datetime, timezone
+
+class MarketSchedule:
+    __slots__ = ("due", "price", "seen", "volatility", "interval")
+
+    def __init__(self, due):
+        self.due = due
+        self.price = None
+        self.seen = 0.0
+        self.volatility = 0.0
+        self.interval = 0.0
+
+class PollScheduler:
+    def __init__(self, min_interval, max_interval, far_distance, streaming_interval, smoothing=0.3):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.far_distance = far_distance
+        self.streaming_interval = streaming_interval
+        self.smoothing = smoothing
+        self.markets = {}
+        self.heap = []
+        self.polled = 0
+
+    def sync(self, market_ids):
+        now = time.monotonic()
+        for market_id in market_ids:
+            if market_id not in self.markets:
+                self.markets[market_id] = MarketSchedule(now)
+                heapq.heappush(self.heap, (now, market_id))
+        for market_id in self.markets.keys() - set(market_ids):
+            del self.markets[market_id]
+
+    def due(self, limit):
+        # most overdue first; whatever does not fit the budget stays due for the next tick
+        now = time.monotonic()
+        ready = []
+        while self.heap and self.heap[0][0] <= now and len(ready) < limit:
+            due, market_id = heapq.heappop(self.heap)
+            schedule = self.markets.get(market_id)
+            if schedule is not None and schedule.due == due:
+                ready.append(market_id)
+        self.polled += len(ready)
+        return ready
+
+    def observe(self, market_id, price, distance, end_date, streaming):
+        schedule = self.markets.get(market_id)
+        if schedule is None:
+            return
+        now = time.monotonic()
+        if price is not None:
+            if schedule.price is not None and now > schedule.seen:
+                # price movement per sqrt(second), comparable across different poll intervals
+                move = abs(price - schedule.price) / math.sqrt(now - schedule.seen)
+                schedule.volatility += self.smoothing * (move - schedule.volatility)
+            schedule.price = price
+            schedule.seen = now
+        schedule.interval = self._interval(schedule, distance, end_date, streaming)
+        self._push(market_id, schedule, now + schedule.interval)
+
+    def accepts(self, market_id, taken_at):
+        # data taken after the last look and younger than the poll interval is as good as a poll
+        schedule = self.markets.get(market_id)
+        if schedule is None:
+            return False
+        if not schedule.interval:
+            return True
+        return taken_at > schedule.seen and time.monotonic() - taken_at <= schedule.interval
+
+    def expedite(self, market_ids):
+        now = time.monotonic()
+        for market_id in market_ids:
+            schedule = self.markets.get(market_id)
+            if schedule is not None and schedule.due > now:
+                self._push(market_id, schedule, now)
+
+    def retry(self, market_ids, delay):
+        now = time.monotonic()
+        for market_id in market_ids:
+            schedule = self.markets.get(market_id)
+            if schedule is not None:
+                self._push(market_id, schedule, now + delay)
+
+    def _push(self, market_id, schedule, due):
+        schedule.due = due
+        heapq.heappush(self.heap, (due, market_id))
+
+    def _interval(self, schedule, distance, end_date, streaming):
+        if distance is None:
+            interval = self.max_interval
+        else:
+            interval = self.max_interval * min(1.0, distance / self.far_distance)
+            if schedule.volatility > 0:
+                # a random walk needs about (distance / volatility)^2 seconds to cover the gap
+                interval = min(interval, 0.25 * (distance / schedule.volatility) ** 2)
+
+        ends_in = seconds_until(end_date)
+        if ends_in is not None and ends_in > 0:
+            interval = min(interval, ends_in / 4)
+
+        if streaming:
+            interval = max(interval, self.streaming_interval)
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def stats(self):
+        intervals = [s.interval for s in self.markets.values() if s.interval]
+        return {
+            "markets": len(self.markets),
+            "polled": self.polled,
+            "fast": sum(1 for i in intervals if i <= self.min_interval * 2),
+            "mean_interval": sum(intervals) / len(intervals) if intervals else 0.0,
+        }
+
+def seconds_until(value):
+    if not value:
+        return None
+    try:
+        moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return (moment - datetime.now(timezone.utc)).total_seconds()